@@ -8,12 +8,19 @@ Author: AI Assistant
 Date: October 2025
 """
 
+import asyncio
+import hashlib
 import os
 import re
+from functools import lru_cache
+from collections import OrderedDict
 from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
 import json
 
+import orjson
+
+from cachetools import TTLCache
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
@@ -21,6 +28,35 @@ from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 
+# Pattern for one DuckDuckGo result entry. Compiled once at import; DOTALL
+# lets snippets span newlines and the non-greedy groups stop at the next
+# field marker, so embedded commas no longer break parsing.
+_DDG_RE = re.compile(
+    r'snippet: (.+?), title: (.+?), link: (https?://\S+?)(?=[,\]\s]|$)', re.DOTALL
+)
+
+# URL validation pattern, compiled once at import so validate_url is a
+# single match call
+_URL_RE = re.compile(
+    r'^https?://'  # http:// or https://
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+
+
+@lru_cache(maxsize=8)
+def _get_llm(model: str, temperature: float) -> ChatOpenAI:
+    """Return a shared ChatOpenAI client for the given model settings.
+
+    Constructing ChatOpenAI builds an httpx client and TLS context; caching
+    by (model, temperature) lets every engine instance reuse one client and
+    its warm connection pool.
+    """
+    return ChatOpenAI(temperature=temperature, model=model)
+
+
 # ============================================================================
 # Configuration and Environment Setup
 # ============================================================================
@@ -86,37 +122,39 @@ class SearchEngine:
         Returns:
             List[Dict[str, str]]: Parsed results with snippet, title, and link
         """
-        results = []
-        
-        try:
-            # Split by snippet delimiter
-            entries = results_string.split(', snippet: ')
-            
-            for entry in entries[1:]:  # Skip first empty split
-                parts = entry.split(', title: ')
-                
-                if len(parts) == 2:
-                    snippet = parts[0].strip()
-                    title_link = parts[1].split(', link: ')
-                    
-                    if len(title_link) == 2:
-                        title = title_link[0].strip()
-                        link = title_link[1].strip()
-                        
-                        results.append({
-                            'snippet': snippet,
-                            'title': title,
-                            'link': link
-                        })
-        except Exception as e:
-            print(f"Error parsing search results: {str(e)}")
-        
-        return results
+        # Single compiled-regex pass; unmatched input simply yields no results
+        return [
+            {
+                'snippet': match.group(1).strip(),
+                'title': match.group(2).strip(),
+                'link': match.group(3).strip()
+            }
+            for match in _DDG_RE.finditer(results_string)
+        ]
     
     def search(self, query: str, site: Optional[str] = None, max_results: int = 3) -> Tuple[List[str], List[Tuple[str, str]]]:
         """
         Perform web search based on query with optional site restriction.
         
+        Synchronous shim around asearch for callers without an event loop.
+        
+        Args:
+            query (str): Search query
+            site (Optional[str]): Specific website to search within
+            max_results (int): Maximum number of results to return
+            
+        Returns:
+            Tuple containing:
+                - List of text snippets
+                - List of tuples with (title, link) pairs
+        """
+        return asyncio.run(self.asearch(query, site, max_results))
+    
+    async def asearch(self, query: str, site: Optional[str] = None, max_results: int = 3) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Async web search; the blocking DuckDuckGo tool runs in worker
+        threads so concurrent queries can share one event loop.
+        
         Args:
             query (str): Search query
             site (Optional[str]): Specific website to search within
@@ -131,16 +169,19 @@ class SearchEngine:
             combined_results = []
             
             if site:
-                # Site-specific search
+                # Site-specific and general searches are independent HTTP
+                # requests, so issue them concurrently instead of back to back
                 specific_query = f"site:{site} {query}"
-                print(f"🔍 Searching within {site}: {query}")
-                specific_results = self.search_tool.run(specific_query)
-                specific_parsed = self.parse_search_results(specific_results)
-                
-                # General search excluding the site
                 general_query = f"-site:{site} {query}"
+                print(f"🔍 Searching within {site}: {query}")
                 print(f"🔍 Searching general web (excluding {site}): {query}")
-                general_results = self.search_tool.run(general_query)
+                
+                specific_results, general_results = await asyncio.gather(
+                    asyncio.to_thread(self.search_tool.run, specific_query),
+                    asyncio.to_thread(self.search_tool.run, general_query),
+                )
+                
+                specific_parsed = self.parse_search_results(specific_results)
                 general_parsed = self.parse_search_results(general_results)
                 
                 # Combine results (prioritize site-specific)
@@ -148,7 +189,7 @@ class SearchEngine:
             else:
                 # General web search
                 print(f"🔍 Searching: {query}")
-                web_results = self.search_tool.run(query)
+                web_results = await asyncio.to_thread(self.search_tool.run, query)
                 combined_results = self.parse_search_results(web_results)[:max_results]
             
             # Extract snippets and sources
@@ -202,7 +243,32 @@ class SummarizationEngine:
         """
         self.model = model
         self.temperature = temperature
-        self.llm = ChatOpenAI(temperature=temperature, model=model)
+        self.llm = _get_llm(model, temperature)
+        
+        # Templates never change after construction, so compile each style's
+        # chain once here instead of re-parsing the template on every call.
+        # The bullet template takes max_points as a prompt variable so one
+        # chain serves any point count.
+        bullet_prompt = PromptTemplate(
+            template="Please summarize the following text in {max_points} concise bullet points:\n\n{text}\n\nSummary:",
+            input_variables=["text", "max_points"],
+        )
+        self._chains = {
+            "bullet": bullet_prompt | self.llm,
+            "paragraph": PromptTemplate(
+                template="Please provide a concise paragraph summary of the following text:\n\n{text}\n\nSummary:",
+                input_variables=["text"],
+            ) | self.llm,
+            "brief": PromptTemplate(
+                template="Please provide a one-sentence summary of the following text:\n\n{text}\n\nSummary:",
+                input_variables=["text"],
+            ) | self.llm,
+        }
+        
+        # Completed summaries keyed by (snippet digest, style, max_points).
+        # Re-running a query or hitting an overlapping snippet costs a dict
+        # lookup instead of another 1-3s LLM round-trip.
+        self._summary_cache: "OrderedDict[Tuple[str, str, int], str]" = OrderedDict()
     
     def summarize(
         self, 
@@ -224,31 +290,21 @@ class SummarizationEngine:
             str: Formatted summary with source attribution
         """
         try:
-            # Select prompt based on style
-            if style == "bullet":
-                prompt_text = f"Please summarize the following text in {max_points} concise bullet points:\n\n{{text}}\n\nSummary:"
-            elif style == "paragraph":
-                prompt_text = "Please provide a concise paragraph summary of the following text:\n\n{text}\n\nSummary:"
-            elif style == "brief":
-                prompt_text = "Please provide a one-sentence summary of the following text:\n\n{text}\n\nSummary:"
-            else:
-                prompt_text = f"Please summarize the following text in {max_points} bullet points:\n\n{{text}}\n\nSummary:"
+            cache_key = self._summary_cache_key(text, style, max_points)
+            summary_content = self._summary_cache_get(cache_key)
             
-            # Create prompt template
-            prompt = PromptTemplate(
-                template=prompt_text,
-                input_variables=["text"],
-            )
-            
-            # Create chain and invoke
-            summary_chain = prompt | self.llm
-            input_data = {"text": text}
-            summary = summary_chain.invoke(input_data)
-            
-            # Extract content
-            summary_content = summary.content if hasattr(summary, 'content') else str(summary)
+            if summary_content is None:
+                # Look up the precompiled chain and invoke
+                summary_chain = self._chains.get(style, self._chains["bullet"])
+                input_data = {"text": text, "max_points": max_points}
+                summary = summary_chain.invoke(input_data)
+                
+                # Extract content
+                summary_content = summary.content if hasattr(summary, 'content') else str(summary)
+                self._summary_cache_put(cache_key, summary_content)
             
-            # Format with source attribution
+            # Format with source attribution (sources vary per result, so
+            # attribution stays outside the cache)
             formatted_summary = self._format_summary(summary_content, source)
             
             return formatted_summary
@@ -257,6 +313,64 @@ class SummarizationEngine:
             print(f"❌ Error in summarization: {str(e)}")
             return ""
     
+    async def asummarize(
+        self, 
+        text: str, 
+        source: Tuple[str, str], 
+        style: str = "bullet",
+        max_points: int = 2
+    ) -> str:
+        """
+        Async variant of summarize for concurrent batch processing.
+        
+        Args:
+            text (str): Text to summarize
+            source (Tuple[str, str]): Source title and URL
+            style (str): Summary style ('bullet', 'paragraph', 'brief')
+            max_points (int): Maximum number of bullet points
+            
+        Returns:
+            str: Formatted summary with source attribution
+        """
+        try:
+            cache_key = self._summary_cache_key(text, style, max_points)
+            summary_content = self._summary_cache_get(cache_key)
+            
+            if summary_content is None:
+                summary_chain = self._chains.get(style, self._chains["bullet"])
+                summary = await summary_chain.ainvoke({"text": text, "max_points": max_points})
+                
+                summary_content = summary.content if hasattr(summary, 'content') else str(summary)
+                self._summary_cache_put(cache_key, summary_content)
+            
+            return self._format_summary(summary_content, source)
+            
+        except Exception as e:
+            print(f"❌ Error in summarization: {str(e)}")
+            return ""
+    
+    # Bound on cached summaries; oldest entries are evicted first
+    _CACHE_MAX_ENTRIES = 1024
+    
+    def _summary_cache_key(self, text: str, style: str, max_points: int) -> Tuple[str, str, int]:
+        """Build the cache key: snippet digest plus the style parameters."""
+        text_hash = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return (text_hash, style, max_points)
+    
+    def _summary_cache_get(self, key: Tuple[str, str, int]) -> Optional[str]:
+        """Return a cached summary and mark it most recently used."""
+        summary = self._summary_cache.get(key)
+        if summary is not None:
+            self._summary_cache.move_to_end(key)
+        return summary
+    
+    def _summary_cache_put(self, key: Tuple[str, str, int], summary: str):
+        """Store a summary, evicting least recently used entries if full."""
+        self._summary_cache[key] = summary
+        self._summary_cache.move_to_end(key)
+        while len(self._summary_cache) > self._CACHE_MAX_ENTRIES:
+            self._summary_cache.popitem(last=False)
+    
     def _format_summary(self, summary: str, source: Tuple[str, str]) -> str:
         """
         Format summary with source information.
@@ -293,12 +407,101 @@ class SummarizationEngine:
         Returns:
             List[str]: List of formatted summaries
         """
-        summaries = []
-        for text, source in zip(texts, sources):
-            summary = self.summarize(text, source, style, max_points)
-            if summary:
-                summaries.append(summary)
-        return summaries
+        return asyncio.run(self.abatch_summarize(texts, sources, style, max_points))
+    
+    async def abatch_summarize(
+        self, 
+        texts: List[str], 
+        sources: List[Tuple[str, str]], 
+        style: str = "bullet",
+        max_points: int = 2
+    ) -> List[str]:
+        """
+        Summarize multiple texts concurrently on the caller's event loop.
+        
+        Args:
+            texts (List[str]): List of texts to summarize
+            sources (List[Tuple[str, str]]): List of source tuples
+            style (str): Summary style
+            max_points (int): Maximum bullet points
+            
+        Returns:
+            List[str]: List of formatted summaries
+        """
+        # Each summary is an independent 1-3s network round-trip, so fan
+        # them all out concurrently instead of paying the latency serially
+        summaries = await asyncio.gather(*[
+            self.asummarize(text, source, style, max_points)
+            for text, source in zip(texts, sources)
+        ])
+        return [summary for summary in summaries if summary]
+    
+    def batch_summarize_single_call(
+        self, 
+        texts: List[str], 
+        sources: List[Tuple[str, str]], 
+        style: str = "bullet",
+        max_points: int = 2
+    ) -> List[str]:
+        """
+        Summarize all texts in one LLM request.
+        
+        Packs every snippet into a single prompt and asks for a JSON array
+        of summaries, amortizing the per-request overhead and shared prompt
+        tokens across the whole batch. Falls back to per-item calls when
+        the response cannot be parsed.
+        
+        Args:
+            texts (List[str]): List of texts to summarize
+            sources (List[Tuple[str, str]]): List of source tuples
+            style (str): Summary style
+            max_points (int): Maximum bullet points
+            
+        Returns:
+            List[str]: List of formatted summaries
+        """
+        if not texts:
+            return []
+        
+        style_instructions = {
+            "bullet": f"{max_points} concise bullet points",
+            "paragraph": "a concise paragraph",
+            "brief": "a single sentence",
+        }
+        instruction = style_instructions.get(style, f"{max_points} concise bullet points")
+        
+        articles = "\n\n".join(
+            f"ARTICLE {index + 1}:\n{text}" for index, text in enumerate(texts)
+        )
+        prompt = (
+            f"You will receive {len(texts)} articles. Summarize each one as "
+            f"{instruction}. Return only a JSON array of {len(texts)} strings, "
+            f"one summary per article, in the same order.\n\n{articles}"
+        )
+        
+        try:
+            response = self.llm.invoke(prompt)
+            content = response.content if hasattr(response, 'content') else str(response)
+            
+            # Tolerate a markdown code fence around the JSON
+            cleaned = content.strip()
+            if cleaned.startswith("```"):
+                cleaned = cleaned.split("```")[1]
+                if cleaned.startswith("json"):
+                    cleaned = cleaned[4:]
+            
+            summaries = json.loads(cleaned)
+            if not isinstance(summaries, list) or len(summaries) != len(texts):
+                raise ValueError(f"expected {len(texts)} summaries, got {summaries!r:.80}")
+            
+        except Exception as e:
+            print(f"⚠️ Single-call batch failed ({str(e)}), falling back to per-item summaries")
+            return self.batch_summarize(texts, sources, style, max_points)
+        
+        return [
+            self._format_summary(str(summary), source)
+            for summary, source in zip(summaries, sources)
+        ]
 
 
 # ============================================================================
@@ -324,7 +527,10 @@ class SearchManager:
             model=self.config.default_model,
             temperature=self.config.default_temperature
         )
-        self.results_cache: Dict[str, Any] = {}
+        # Bounded and TTL'd so the cache cannot grow without limit and
+        # entries older than an hour fall out rather than drifting from
+        # what a fresh search would return
+        self.results_cache: TTLCache = TTLCache(maxsize=256, ttl=3600)
     
     def search_and_summarize(
         self,
@@ -337,6 +543,36 @@ class SearchManager:
         """
         Perform search and summarization in one operation.
         
+        Args:
+            query (str): Search query
+            specific_site (Optional[str]): Specific website to search
+            max_results (int): Maximum results to retrieve
+            summary_style (str): Style of summary ('bullet', 'paragraph', 'brief')
+            max_points (int): Maximum bullet points
+            
+        Returns:
+            Dict containing summaries, sources, and metadata
+        """
+        return asyncio.run(self.asearch_and_summarize(
+            query=query,
+            specific_site=specific_site,
+            max_results=max_results,
+            summary_style=summary_style,
+            max_points=max_points
+        ))
+    
+    async def asearch_and_summarize(
+        self,
+        query: str,
+        specific_site: Optional[str] = None,
+        max_results: int = 3,
+        summary_style: str = "bullet",
+        max_points: int = 2
+    ) -> Dict[str, Any]:
+        """
+        Async search and summarization so multiple user queries can share
+        one event loop instead of blocking each other.
+        
         Args:
             query (str): Search query
             specific_site (Optional[str]): Specific website to search
@@ -348,14 +584,17 @@ class SearchManager:
             Dict containing summaries, sources, and metadata
         """
         try:
-            # Check cache
-            cache_key = f"{query}_{specific_site}_{max_results}_{summary_style}"
+            # Check cache (canonical key over every parameter that affects
+            # the result, including max_points)
+            cache_key = orjson.dumps(
+                [query, specific_site, max_results, summary_style, max_points]
+            )
             if cache_key in self.results_cache:
                 print("📦 Loading results from cache...")
                 return self.results_cache[cache_key]
             
             # Perform search
-            web_knowledge, sources = self.search_engine.search(
+            web_knowledge, sources = await self.search_engine.asearch(
                 query=query,
                 site=specific_site,
                 max_results=max_results
@@ -373,7 +612,7 @@ class SearchManager:
             
             # Perform summarization
             print("📝 Generating summaries...")
-            summaries = self.summarization_engine.batch_summarize(
+            summaries = await self.summarization_engine.abatch_summarize(
                 texts=web_knowledge,
                 sources=sources,
                 style=summary_style,
@@ -414,7 +653,7 @@ class SearchManager:
     
     def clear_cache(self):
         """Clear results cache."""
-        self.results_cache = {}
+        self.results_cache.clear()
         print("🗑️ Cache cleared")
     
     def clear_history(self):
@@ -434,25 +673,31 @@ class SearchManager:
             str: Formatted export string
         """
         if format == "json":
-            return json.dumps(results, indent=2)
+            # C-level serializer; markedly faster than stdlib json on
+            # dicts full of long summary strings
+            return orjson.dumps(results, option=orjson.OPT_INDENT_2).decode()
         
         elif format == "md":
-            output = f"# Search Results: {results.get('query', 'N/A')}\n\n"
-            output += f"**Date:** {results.get('timestamp', 'N/A')}\n"
-            output += f"**Site:** {results.get('specific_site', 'All websites')}\n\n"
-            output += "## Summaries\n\n"
-            for summary in results.get('summaries', []):
-                output += summary + "\n"
-            return output
+            # Collect parts and join once; += on a growing string goes
+            # quadratic on large exports
+            parts = [
+                f"# Search Results: {results.get('query', 'N/A')}\n",
+                f"**Date:** {results.get('timestamp', 'N/A')}",
+                f"**Site:** {results.get('specific_site', 'All websites')}\n",
+                "## Summaries\n",
+            ]
+            parts.extend(results.get('summaries', []))
+            return "\n".join(parts) + "\n"
         
         else:  # txt format
-            output = f"Search Results: {results.get('query', 'N/A')}\n"
-            output += f"Date: {results.get('timestamp', 'N/A')}\n"
-            output += f"Site: {results.get('specific_site', 'All websites')}\n"
-            output += "=" * 80 + "\n\n"
-            for summary in results.get('summaries', []):
-                output += summary + "\n"
-            return output
+            parts = [
+                f"Search Results: {results.get('query', 'N/A')}",
+                f"Date: {results.get('timestamp', 'N/A')}",
+                f"Site: {results.get('specific_site', 'All websites')}",
+                "=" * 80 + "\n",
+            ]
+            parts.extend(results.get('summaries', []))
+            return "\n".join(parts) + "\n"
 
 
 # ============================================================================
@@ -469,14 +714,7 @@ def validate_url(url: str) -> bool:
     Returns:
         bool: True if valid URL, False otherwise
     """
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
-    return url_pattern.match(url) is not None
+    return _URL_RE.match(url) is not None
 
 
 def format_timestamp(iso_timestamp: str) -> str:
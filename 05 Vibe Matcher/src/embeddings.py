@@ -8,6 +8,7 @@ so the notebook can run without hitting the API during exploration.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 from pathlib import Path
@@ -33,8 +34,11 @@ def _load_cache(path: Path) -> Dict[str, List[float]]:
 
 def _save_cache(path: Path, cache: Dict[str, List[float]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    # atomic write: dump to a temp file, then rename over the target
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
         json.dump(cache, f)
+    os.replace(tmp, path)
 
 
 def embed_texts(
@@ -85,9 +89,12 @@ def embed_texts(
             cache[txt] = vec.tolist()
         _save_cache(path, cache)
 
-    # collect vectors in same order as texts
-    vecs = [np.array(cache[t], dtype=float) for t in texts]
-    return np.vstack(vecs)
+    # collect vectors in same order as texts, into one preallocated buffer
+    dim = len(next(iter(cache.values()))) if cache else 1536
+    out = np.empty((len(texts), dim), dtype=np.float32)
+    for i, t in enumerate(texts):
+        out[i] = cache[t]
+    return out
 
 
 def _synthetic_vectors(texts: Iterable[str], dim: int = 1536) -> List[np.ndarray]:
@@ -98,10 +105,12 @@ def _synthetic_vectors(texts: Iterable[str], dim: int = 1536) -> List[np.ndarray
     """
     out = []
     for t in texts:
-        # create a seed from the text in a stable way
-        seed = abs(hash(t)) % (2 ** 31)
+        # create a seed from the text in a stable way (hash() is salted
+        # per process, so it is not stable across runs)
+        digest = hashlib.blake2b(t.encode("utf-8"), digest_size=4).digest()
+        seed = int.from_bytes(digest, "little") % (2 ** 31)
         rng = np.random.RandomState(seed)
-        vec = rng.normal(size=(dim,)).astype(float)
+        vec = rng.normal(size=(dim,)).astype(np.float32)
         # normalize to unit length to mimic real embeddings
         vec = vec / (np.linalg.norm(vec) + 1e-12)
         out.append(vec)
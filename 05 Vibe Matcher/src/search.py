@@ -8,6 +8,11 @@ import numpy as np
 import pandas as pd
 from sklearn.metrics.pairwise import cosine_similarity
 
+try:
+    import simsimd
+except Exception:  # pragma: no cover - optional SIMD kernels
+    simsimd = None
+
 
 @dataclass
 class RankedItem:
@@ -41,13 +46,25 @@ def rank_by_similarity(
         q = query_embedding.reshape(1, -1)
     else:
         q = query_embedding
-    sims = cosine_similarity(q, product_embeddings).reshape(-1)
+    if simsimd is not None:
+        # SIMD cosine distance, flipped back to similarity
+        sims = 1.0 - np.asarray(simsimd.cdist(
+            q.astype(np.float32, copy=False),
+            product_embeddings.astype(np.float32, copy=False),
+            metric="cosine",
+        )).reshape(-1)
+    else:
+        sims = cosine_similarity(q, product_embeddings).reshape(-1)
     # transform to 0-1
     sims01 = (sims + 1.0) / 2.0
 
-    # stable argsort descending
-    order = np.argsort(-sims01, kind="mergesort")
-    top = order[:topk]
+    # top-k selection: O(n + k log k) partition instead of a full argsort
+    n = len(sims01)
+    if topk >= n:
+        top = np.argsort(-sims01, kind="mergesort")
+    else:
+        part = np.argpartition(sims01, n - topk)[n - topk:]
+        top = part[np.argsort(-sims01[part], kind="mergesort")]
     items: List[RankedItem] = []
     for rank, idx in enumerate(top, start=1):
         items.append(
@@ -4,6 +4,12 @@ from __future__ import annotations
 import re
 from typing import Optional
 
+# Compiled once at import so normalize_text does not re-hit the regex
+# cache on every call
+_RE_CTRL_WS = re.compile(r"[\r\n\t]+")
+_RE_WS = re.compile(r"\s+")
+_RE_NON_PRINTABLE = re.compile(r"[^\x20-\x7E\n]")
+
 
 def normalize_text(text: str) -> str:
     """Normalize a short text: trim, lowercase, collapse whitespace, remove control chars.
@@ -19,11 +25,11 @@ def normalize_text(text: str) -> str:
     # Basic normalizations
     s = text.strip().lower()
     # replace newlines/tabs with space
-    s = re.sub(r"[\r\n\t]+", " ", s)
+    s = _RE_CTRL_WS.sub(" ", s)
     # collapse multiple spaces
-    s = re.sub(r"\s+", " ", s)
+    s = _RE_WS.sub(" ", s)
     # remove uncommon control characters
-    s = re.sub(r"[^\x20-\x7E\n]", "", s)
+    s = _RE_NON_PRINTABLE.sub("", s)
     return s
 
 
@@ -31,5 +37,5 @@ def ensure_two_words(text: Optional[str]) -> bool:
     """Return True when text looks like at least two words (simple guard for query input)."""
     if not text:
         return False
-    parts = [p for p in re.split(r"\s+", text.strip()) if p]
+    parts = [p for p in _RE_WS.split(text.strip()) if p]
     return len(parts) >= 2
@@ -3,16 +3,17 @@ Vibe Matcher Backend
 Core logic for fashion product recommendation using embeddings and cosine similarity.
 """
 
+import asyncio
+import hashlib
 import os
-import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
-from sklearn.metrics.pairwise import cosine_similarity
 
 try:
     import openai
@@ -20,6 +21,11 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+try:
+    import faiss
+except ImportError:  # optional ANN index; ranking falls back to brute force
+    faiss = None
+
 
 # Configuration Constants
 FALLBACK_THRESHOLD = 0.35
@@ -27,7 +33,9 @@ GOOD_HIT_THRESHOLD = 0.7
 EMBEDDING_MODEL = "text-embedding-ada-002"
 EMBEDDING_DIM = 1536
 TOP_K = 3
-CACHE_PATH = Path("data/embeddings_cache.json")
+CACHE_PATH = Path("data/embeddings_cache.npz")
+EMBED_BATCH_SIZE = 512
+EMBED_MAX_CONCURRENCY = 8
 
 
 @dataclass
@@ -41,80 +49,95 @@ class RankedResult:
     description: str = ""
 
 
+# Source records for the mock catalog; get_product_catalog turns them
+# into the shared DataFrame on first use
+_PRODUCTS_DATA = [
+    {
+        "id": 1,
+        "name": "Boho Maxi Dress",
+        "desc": "Flowy silhouette in earthy tones with intricate embroidery, perfect for outdoor festivals and weekend markets. Pairs well with sandals and layered jewelry.",
+        "vibes": ["boho", "cozy", "earthy", "festival"]
+    },
+    {
+        "id": 2,
+        "name": "Urban Streetwear Bomber",
+        "desc": "Bold graphic bomber jacket with oversized fit and metallic accents. Makes a statement in the city with edgy attitude and contemporary street style.",
+        "vibes": ["urban", "streetwear", "bold", "edgy", "energetic"]
+    },
+    {
+        "id": 3,
+        "name": "Minimalist Cashmere Sweater",
+        "desc": "Soft cashmere knit in neutral tones with clean lines and timeless design. Ultimate comfort meets understated elegance for everyday wear.",
+        "vibes": ["minimal", "cozy", "soft", "elegant", "timeless"]
+    },
+    {
+        "id": 4,
+        "name": "Sustainable Linen Set",
+        "desc": "Eco-friendly linen co-ord set in natural beige. Breathable fabric perfect for conscious consumers seeking comfort and sustainability without compromising style.",
+        "vibes": ["sustainable", "minimal", "earthy", "conscious", "comfortable"]
+    },
+    {
+        "id": 5,
+        "name": "Athleisure Jogger Set",
+        "desc": "Performance fabric meets loungewear comfort. Sleek joggers and matching hoodie for gym sessions or relaxed weekend vibes with modern athletic aesthetic.",
+        "vibes": ["athletic", "comfortable", "modern", "casual", "energetic"]
+    },
+    {
+        "id": 6,
+        "name": "Vintage Denim Jacket",
+        "desc": "Classic distressed denim with retro wash and brass buttons. Timeless wardrobe staple that adds rugged charm and nostalgic appeal to any outfit.",
+        "vibes": ["vintage", "casual", "timeless", "rugged", "classic"]
+    },
+    {
+        "id": 7,
+        "name": "Cozy Loungewear Bundle",
+        "desc": "Ultra-soft matching sweatpants and oversized pullover in muted pastels. Perfect for self-care Sundays, reading nooks, and Netflix marathons at home.",
+        "vibes": ["cozy", "soft", "comfortable", "relaxed", "homey"]
+    },
+    {
+        "id": 8,
+        "name": "Chic Blazer Dress",
+        "desc": "Sharp tailoring meets feminine silhouette. Structured blazer-style dress in monochrome palette perfect for power meetings or sophisticated evening events.",
+        "vibes": ["chic", "elegant", "sophisticated", "modern", "powerful"]
+    },
+    {
+        "id": 9,
+        "name": "Festival Fringe Top",
+        "desc": "Playful crop top with cascading fringe details and tribal-inspired patterns. Free-spirited design perfect for music festivals and bohemian outdoor adventures.",
+        "vibes": ["boho", "festival", "playful", "free-spirited", "tribal"]
+    },
+    {
+        "id": 10,
+        "name": "Tech Wear Cargo Pants",
+        "desc": "Futuristic utility pants with multiple pockets and technical fabric. Perfect for urban explorers who value function, innovation, and cutting-edge street style.",
+        "vibes": ["urban", "streetwear", "futuristic", "functional", "innovative"]
+    }
+]
+
+
+@lru_cache(maxsize=1)
 def get_product_catalog() -> pd.DataFrame:
     """Get the mock fashion product catalog.
     
+    The catalog is a constant literal, so the DataFrame (and the text
+    normalization pass over it) is built once per process; callers share
+    the same object and must not mutate it.
+    
     Returns:
         DataFrame with product information
     """
-    products_data = [
-        {
-            "id": 1,
-            "name": "Boho Maxi Dress",
-            "desc": "Flowy silhouette in earthy tones with intricate embroidery, perfect for outdoor festivals and weekend markets. Pairs well with sandals and layered jewelry.",
-            "vibes": ["boho", "cozy", "earthy", "festival"]
-        },
-        {
-            "id": 2,
-            "name": "Urban Streetwear Bomber",
-            "desc": "Bold graphic bomber jacket with oversized fit and metallic accents. Makes a statement in the city with edgy attitude and contemporary street style.",
-            "vibes": ["urban", "streetwear", "bold", "edgy", "energetic"]
-        },
-        {
-            "id": 3,
-            "name": "Minimalist Cashmere Sweater",
-            "desc": "Soft cashmere knit in neutral tones with clean lines and timeless design. Ultimate comfort meets understated elegance for everyday wear.",
-            "vibes": ["minimal", "cozy", "soft", "elegant", "timeless"]
-        },
-        {
-            "id": 4,
-            "name": "Sustainable Linen Set",
-            "desc": "Eco-friendly linen co-ord set in natural beige. Breathable fabric perfect for conscious consumers seeking comfort and sustainability without compromising style.",
-            "vibes": ["sustainable", "minimal", "earthy", "conscious", "comfortable"]
-        },
-        {
-            "id": 5,
-            "name": "Athleisure Jogger Set",
-            "desc": "Performance fabric meets loungewear comfort. Sleek joggers and matching hoodie for gym sessions or relaxed weekend vibes with modern athletic aesthetic.",
-            "vibes": ["athletic", "comfortable", "modern", "casual", "energetic"]
-        },
-        {
-            "id": 6,
-            "name": "Vintage Denim Jacket",
-            "desc": "Classic distressed denim with retro wash and brass buttons. Timeless wardrobe staple that adds rugged charm and nostalgic appeal to any outfit.",
-            "vibes": ["vintage", "casual", "timeless", "rugged", "classic"]
-        },
-        {
-            "id": 7,
-            "name": "Cozy Loungewear Bundle",
-            "desc": "Ultra-soft matching sweatpants and oversized pullover in muted pastels. Perfect for self-care Sundays, reading nooks, and Netflix marathons at home.",
-            "vibes": ["cozy", "soft", "comfortable", "relaxed", "homey"]
-        },
-        {
-            "id": 8,
-            "name": "Chic Blazer Dress",
-            "desc": "Sharp tailoring meets feminine silhouette. Structured blazer-style dress in monochrome palette perfect for power meetings or sophisticated evening events.",
-            "vibes": ["chic", "elegant", "sophisticated", "modern", "powerful"]
-        },
-        {
-            "id": 9,
-            "name": "Festival Fringe Top",
-            "desc": "Playful crop top with cascading fringe details and tribal-inspired patterns. Free-spirited design perfect for music festivals and bohemian outdoor adventures.",
-            "vibes": ["boho", "festival", "playful", "free-spirited", "tribal"]
-        },
-        {
-            "id": 10,
-            "name": "Tech Wear Cargo Pants",
-            "desc": "Futuristic utility pants with multiple pockets and technical fabric. Perfect for urban explorers who value function, innovation, and cutting-edge street style.",
-            "vibes": ["urban", "streetwear", "futuristic", "functional", "innovative"]
-        }
-    ]
-    
-    df = pd.DataFrame(products_data)
+    df = pd.DataFrame(_PRODUCTS_DATA)
     df['desc_normalized'] = df['desc'].apply(normalize_text)
     return df
 
 
+# Whitespace handling for normalize_text, set up once at import:
+# translate maps control whitespace to spaces at C speed, the compiled
+# regex only runs when a run of repeated spaces is actually present
+_CTRL_TRANSLATION = str.maketrans("\r\n\t", "   ")
+_RE_WS = re.compile(r"\s+")
+
+
 def normalize_text(text: str) -> str:
     """Normalize text: trim, lowercase, collapse whitespace.
     
@@ -126,47 +149,152 @@ def normalize_text(text: str) -> str:
     """
     if not text:
         return ""
-    s = text.strip().lower()
-    s = re.sub(r"[\r\n\t]+", " ", s)
-    s = re.sub(r"\s+", " ", s)
+    s = text.strip().lower().translate(_CTRL_TRANSLATION)
+    if "  " in s:
+        s = _RE_WS.sub(" ", s)
     return s
 
 
-def load_cache() -> Dict[str, List[float]]:
-    """Load embedding cache from disk."""
+# Process-local view of the on-disk cache; embed_texts goes through
+# _get_cache so repeated queries skip re-reading the archive entirely
+_CACHE: Optional[Dict[str, np.ndarray]] = None
+_CACHE_MTIME: Optional[float] = None
+
+
+def _get_cache() -> Dict[str, np.ndarray]:
+    """Return the in-memory embedding cache, reloading from disk only when
+    the file's mtime changed (e.g. another process wrote to it)."""
+    global _CACHE, _CACHE_MTIME
+    try:
+        mtime = CACHE_PATH.stat().st_mtime
+    except OSError:
+        mtime = None
+    if _CACHE is None or mtime != _CACHE_MTIME:
+        _CACHE = load_cache()
+        _CACHE_MTIME = mtime
+    return _CACHE
+
+
+def load_cache() -> Dict[str, np.ndarray]:
+    """Load embedding cache from disk.
+    
+    The cache is stored as an NPZ archive (parallel key and vector arrays)
+    in float16, so startup is one array load instead of parsing thousands
+    of JSON floats in Python, and the file is ~16x smaller than the old
+    indented-JSON format.
+    """
     if not CACHE_PATH.exists():
         return {}
     try:
-        with CACHE_PATH.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        with np.load(CACHE_PATH, allow_pickle=False) as data:
+            keys = data["keys"]
+            vecs = data["vecs"].astype(np.float32)
+        return {str(key): vecs[i] for i, key in enumerate(keys)}
     except Exception:
         return {}
 
 
-def save_cache(cache: Dict[str, List[float]]) -> None:
-    """Save embedding cache to disk."""
+def save_cache(cache: Dict[str, np.ndarray]) -> None:
+    """Save embedding cache to disk as a compressed float16 NPZ archive.
+    
+    float16 keeps ~3 decimal digits, which is far below the noise floor
+    of embedding similarity scores.
+    """
+    if not cache:
+        return
     CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with CACHE_PATH.open("w", encoding="utf-8") as f:
-        json.dump(cache, f, indent=2)
+    keys = np.array(list(cache.keys()))
+    vecs = np.stack(
+        [np.asarray(cache[key], dtype=np.float32) for key in cache]
+    ).astype(np.float16)
+    
+    # Write to a sibling temp file and move it into place: os.replace is
+    # atomic, so a crash mid-write can never leave a truncated cache that
+    # load_cache would then silently discard
+    tmp_path = CACHE_PATH.with_suffix(".npz.tmp")
+    with tmp_path.open("wb") as f:
+        np.savez_compressed(f, keys=keys, vecs=vecs)
+    os.replace(tmp_path, CACHE_PATH)
+    
+    # Our own write should not trigger a reload on the next query
+    global _CACHE, _CACHE_MTIME
+    _CACHE = cache
+    _CACHE_MTIME = CACHE_PATH.stat().st_mtime
+
+
+def _splitmix64(counters: np.ndarray) -> np.ndarray:
+    """Vectorized SplitMix64 finalizer over an array of uint64 counters.
+    
+    Statistically solid for seeding purposes and, unlike RandomState,
+    costs no per-text generator construction - the whole vector of random
+    bits comes out of a handful of SIMD-friendly integer ops.
+    """
+    z = counters + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
 
 
 def create_synthetic_embedding(text: str, dim: int = EMBEDDING_DIM) -> np.ndarray:
     """Generate deterministic synthetic embedding for offline testing.
     
+    Draws Gaussians via Box-Muller over SplitMix64 bits instead of building
+    a Mersenne-Twister RandomState per text, so the whole vector is a few
+    vectorized numpy passes.
+    
     Args:
         text: input text
         dim: embedding dimension
     
     Returns:
-        Normalized numpy array of shape (dim,)
+        Normalized float32 numpy array of shape (dim,)
     """
-    seed = abs(hash(text)) % (2 ** 31)
-    rng = np.random.RandomState(seed)
-    vec = rng.normal(size=(dim,)).astype(float)
-    vec = vec / (np.linalg.norm(vec) + 1e-12)
+    # blake2b, not hash(): the builtin is salted per process, which made
+    # "deterministic" vectors differ across restarts and invalidated the
+    # on-disk cache on every cold start
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    seed = np.uint64(int.from_bytes(digest, "little"))
+    half = (dim + 1) // 2
+    counters = seed + np.arange(2 * half, dtype=np.uint64)
+    bits = _splitmix64(counters)
+    
+    # Top 53 bits -> uniform [0, 1); Box-Muller pairs -> standard normals
+    uniform = (bits >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+    radius = np.sqrt(-2.0 * np.log(np.clip(uniform[:half], 1e-12, None)))
+    theta = 2.0 * np.pi * uniform[half:]
+    
+    vec = np.empty(2 * half, dtype=np.float32)
+    vec[0::2] = radius * np.cos(theta)
+    vec[1::2] = radius * np.sin(theta)
+    vec = vec[:dim]
+    vec /= np.linalg.norm(vec) + 1e-12
     return vec
 
 
+async def _embed_batches_async(batches: List[List[str]]) -> List[dict]:
+    """Embed sub-batches concurrently against the OpenAI API.
+    
+    A semaphore caps in-flight requests so a large catalog ingest does not
+    trip the rate limiter, while still overlapping the network round-trips.
+    
+    Args:
+        batches: lists of texts, each within the per-request size cap
+    
+    Returns:
+        API responses in the same order as batches
+    """
+    semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENCY)
+    
+    async def _one(batch: List[str]) -> dict:
+        async with semaphore:
+            return await openai.Embedding.acreate(
+                model=EMBEDDING_MODEL,
+                input=batch
+            )
+    
+    return await asyncio.gather(*[_one(batch) for batch in batches])
+
+
 def embed_texts(texts: List[str], use_cache: bool = True) -> Tuple[np.ndarray, str]:
     """Generate embeddings for a list of texts.
     
@@ -177,7 +305,7 @@ def embed_texts(texts: List[str], use_cache: bool = True) -> Tuple[np.ndarray, s
     Returns:
         Tuple of (embeddings array, status message)
     """
-    cache = load_cache() if use_cache else {}
+    cache = _get_cache() if use_cache else {}
     to_request = [t for t in texts if t not in cache]
     
     status_msg = ""
@@ -186,71 +314,126 @@ def embed_texts(texts: List[str], use_cache: bool = True) -> Tuple[np.ndarray, s
     # Try OpenAI API
     if to_request and api_key and OPENAI_AVAILABLE:
         try:
-            response = openai.Embedding.create(
-                model=EMBEDDING_MODEL,
-                input=to_request
-            )
-            for txt, item in zip(to_request, response['data']):
-                cache[txt] = item['embedding']
+            # Sort by length so each sub-batch carries a similar token
+            # load, then embed all batches concurrently
+            ordered = sorted(to_request, key=len)
+            batches = [
+                ordered[i:i + EMBED_BATCH_SIZE]
+                for i in range(0, len(ordered), EMBED_BATCH_SIZE)
+            ]
+            responses = asyncio.run(_embed_batches_async(batches))
+            for batch, response in zip(batches, responses):
+                for txt, item in zip(batch, response['data']):
+                    cache[txt] = item['embedding']
             if use_cache:
                 save_cache(cache)
             status_msg = f"✅ Embedded {len(to_request)} texts using OpenAI API"
         except Exception as e:
             status_msg = f"⚠️ OpenAI API error: {str(e)}. Using synthetic embeddings."
             for txt in to_request:
-                cache[txt] = create_synthetic_embedding(txt).tolist()
+                cache[txt] = create_synthetic_embedding(txt)
             if use_cache:
                 save_cache(cache)
     elif to_request:
         # Use synthetic embeddings
         for txt in to_request:
-            cache[txt] = create_synthetic_embedding(txt).tolist()
+            cache[txt] = create_synthetic_embedding(txt)
         if use_cache:
             save_cache(cache)
         status_msg = f"ℹ️ Generated {len(to_request)} synthetic embeddings (no API key set)"
     else:
         status_msg = f"✅ Using {len(texts)} cached embeddings"
     
-    # Collect vectors in original order
-    vectors = [np.array(cache[t], dtype=float) for t in texts]
-    return np.vstack(vectors), status_msg
+    # Gather rows into one preallocated buffer: a single allocation and
+    # one copy pass instead of N temporary arrays plus a vstack recopy
+    out = np.empty((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    for i, t in enumerate(texts):
+        out[i] = cache[t]
+    return out, status_msg
+
+
+def build_index(product_embeddings: np.ndarray):
+    """Wrap pre-normalized product embeddings in a FAISS index.
+    
+    Inner product over unit-norm rows equals cosine similarity, so a flat
+    IP index gives identical results to the brute-force path while scaling
+    to much larger catalogs (and can be swapped for IndexHNSWFlat /
+    IndexIVFPQ as the catalog grows).
+    
+    Args:
+        product_embeddings: shape (n, dim), rows L2-normalized
+    
+    Returns:
+        faiss.IndexFlatIP, or None when faiss is not installed
+    """
+    if faiss is None:
+        return None
+    index = faiss.IndexFlatIP(product_embeddings.shape[1])
+    index.add(np.ascontiguousarray(product_embeddings, dtype=np.float32))
+    return index
 
 
 def rank_by_similarity(
     query_embedding: np.ndarray,
     product_embeddings: np.ndarray,
     products_df: pd.DataFrame,
-    topk: int = TOP_K
+    topk: int = TOP_K,
+    index=None
 ) -> List[RankedResult]:
     """Rank products by cosine similarity to query.
     
     Args:
         query_embedding: shape (1, dim) or (dim,)
-        product_embeddings: shape (n_products, dim)
+        product_embeddings: shape (n_products, dim), rows L2-normalized
+            (initialize_embeddings guarantees this)
         products_df: DataFrame with product info
         topk: number of top results to return
+        index: optional FAISS index from build_index; used instead of the
+            brute-force scan when provided
     
     Returns:
         List of RankedResult objects, sorted by descending similarity
     """
-    if query_embedding.ndim == 1:
-        query_embedding = query_embedding.reshape(1, -1)
-    
-    similarities = cosine_similarity(query_embedding, product_embeddings).reshape(-1)
-    similarities_01 = (similarities + 1.0) / 2.0
-    
-    top_indices = np.argsort(-similarities_01, kind='mergesort')[:topk]
+    # With unit-norm product rows and a unit-norm query, cosine similarity
+    # collapses to one BLAS matrix-vector product - half the FLOPs and no
+    # per-call norm pass over the product matrix
+    q = np.ascontiguousarray(query_embedding.reshape(-1), dtype=np.float32)
+    q /= np.linalg.norm(q) + 1e-12
+    
+    if index is not None:
+        scores, indices = index.search(q.reshape(1, -1), topk)
+        top_indices = indices[0]
+        top_scores_01 = (scores[0] + 1.0) / 2.0
+    else:
+        similarities = product_embeddings @ q
+        n = len(similarities)
+        if topk >= n:
+            top_indices = np.argsort(-similarities, kind='mergesort')
+        else:
+            # O(n + k log k): partition out the top-k unordered, then sort
+            # only those k instead of argsorting the whole catalog
+            part = np.argpartition(similarities, n - topk)[n - topk:]
+            top_indices = part[np.argsort(-similarities[part], kind='mergesort')]
+        # Rescale to 0-1 only for the k winners; nothing downstream reads
+        # the scores of the products that did not make the cut
+        top_scores_01 = (similarities[top_indices] + 1.0) / 2.0
+    
+    # Pull the columns out once as plain arrays; .iloc per hit would
+    # materialize a fresh mixed-dtype Series for every result row
+    ids = products_df['id'].to_numpy()
+    names = products_df['name'].to_numpy()
+    vibes = products_df['vibes'].to_numpy()
+    descs = products_df['desc'].to_numpy()
     
     results = []
-    for rank, idx in enumerate(top_indices, start=1):
-        product = products_df.iloc[idx]
+    for rank, (idx, score) in enumerate(zip(top_indices, top_scores_01), start=1):
         results.append(RankedResult(
             rank=rank,
-            product_id=int(product['id']),
-            name=str(product['name']),
-            vibes=list(product['vibes']),
-            similarity_score=float(similarities_01[idx]),
-            description=str(product['desc'])
+            product_id=int(ids[idx]),
+            name=str(names[idx]),
+            vibes=list(vibes[idx]),
+            similarity_score=float(score),
+            description=str(descs[idx])
         ))
     
     return results
@@ -269,8 +452,10 @@ def validate_query(query: str) -> Tuple[bool, str]:
     if not query:
         return False, "❌ Empty query! Please enter at least 2 descriptive words."
     
-    words = query.split()
-    if len(words) < 2:
+    # Only the presence of a second word matters; maxsplit=1 stops the
+    # scan at the first separator instead of splitting the whole query
+    # into a throwaway list
+    if len(query.split(None, 1)) < 2:
         return False, "❌ Query too short! Please enter at least 2 descriptive words."
     
     return True, ""
@@ -322,18 +507,47 @@ def search_vibes(
     return results, is_fallback, embed_status, warning_msg
 
 
+@lru_cache(maxsize=1)
 def initialize_embeddings() -> Tuple[pd.DataFrame, np.ndarray, str]:
     """Initialize product catalog and embeddings.
     
+    Memoized so per-request callers (Streamlit reruns, web handlers) pay
+    for the DataFrame, the (N, 1536) embedding matrix and the cache load
+    once per process. The returned objects are shared - treat them as
+    read-only.
+    
     Returns:
         Tuple of (products_df, product_embeddings, status_message)
     """
     products_df = get_product_catalog()
     product_texts = products_df['desc_normalized'].tolist()
     product_embeddings, status = embed_texts(product_texts)
+    # Normalize once at startup; ranking then needs neither dtype
+    # conversion nor norm computation per query
+    product_embeddings = _normalize_rows(product_embeddings)
     return products_df, product_embeddings, status
 
 
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize matrix rows into a contiguous float32 array.
+    
+    Args:
+        matrix: shape (n, dim)
+    
+    Returns:
+        Unit-norm rows; dotting a unit-norm query against them yields
+        cosine similarity directly
+    
+    float32 is deliberate: it is the narrowest dtype the BLAS matvec in
+    rank_by_similarity accepts. Quantizing further (float16/int8) would
+    push the dot through numpy's generic loops, which promote to wider
+    types instead of using narrow SIMD - slower, not faster.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / (norms + 1e-12)
+
+
 def get_all_vibes(products_df: pd.DataFrame) -> List[str]:
     """Extract all unique vibe tags from catalog.
     
@@ -343,10 +557,9 @@ def get_all_vibes(products_df: pd.DataFrame) -> List[str]:
     Returns:
         Sorted list of unique vibe tags
     """
-    all_vibes = set()
-    for vibes_list in products_df['vibes']:
-        all_vibes.update(vibes_list)
-    return sorted(list(all_vibes))
+    # explode flattens the nested lists and unique dedups, both in C,
+    # replacing the Python-level set.update loop over every row
+    return sorted(products_df['vibes'].explode().dropna().unique().tolist())
 
 
 def get_metrics_summary(results: List[RankedResult]) -> Dict[str, float]:
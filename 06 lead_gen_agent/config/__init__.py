@@ -24,6 +24,10 @@ class Config:
     APIFY_TOKEN: str = os.getenv("APIFY_TOKEN", "")
     APIFY_DEFAULT_TIMEOUT: int = int(os.getenv("APIFY_DEFAULT_TIMEOUT", "300"))
     APIFY_POLL_INTERVAL: int = int(os.getenv("APIFY_POLL_INTERVAL", "5"))
+    # Disk-backed run cache: repeated identical scrapes are served from disk
+    # instead of re-spending Apify credits (TTL in seconds, default 24h)
+    APIFY_CACHE_DIR: str = os.getenv("APIFY_CACHE_DIR", "./data/apify_cache")
+    APIFY_CACHE_TTL: int = int(os.getenv("APIFY_CACHE_TTL", "86400"))
     
     # Example actor IDs for common scraping tasks
     # These can be replaced with your own or configured per use case
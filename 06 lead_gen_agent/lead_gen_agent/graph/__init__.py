@@ -3,6 +3,7 @@ Lead Generation Agent - LangGraph Workflow.
 Orchestrates the lead generation, enrichment, and scoring pipeline.
 """
 
+import asyncio
 import logging
 from typing import TypedDict, Annotated, Optional, List, Dict, Any
 from datetime import datetime
@@ -333,6 +334,82 @@ class LeadGenerationWorkflow:
                 "completed_at": datetime.now().isoformat(),
             }
 
+    async def arun(
+        self,
+        query: str,
+        sources: Optional[List[str]] = None,
+        icp_config: Optional[Dict[str, Any]] = None,
+        max_results: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Async variant of run that collects all requested sources concurrently.
+        
+        The compiled graph routes to a single source per run; here every
+        requested source scrapes in parallel (asyncio.gather over worker
+        threads) before the shared enrich/score/aggregate stages, so
+        end-to-end latency is max(tool times) instead of their sum.
+        
+        Args:
+            query: Search query (e.g., "AI startups in California")
+            sources: Data sources to use ("linkedin", "web_search")
+            icp_config: ICP configuration dict
+            max_results: Maximum results per source
+        
+        Returns:
+            Dictionary with leads, statistics, and errors
+        """
+        state: AgentState = {
+            "query": query,
+            "sources": sources or ["web_search"],
+            "icp_config": icp_config or {},
+            "max_results": max_results,
+            "raw_leads": [],
+            "enriched_leads": [],
+            "scored_leads": [],
+            "final_leads": [],
+            "statistics": {},
+            "errors": [],
+            "started_at": None,
+            "completed_at": None,
+        }
+        
+        try:
+            state = self._process_input(state)
+            
+            # Source nodes append to the shared raw_leads list and record
+            # their own errors, so they can safely run side by side
+            scrapers = []
+            if "linkedin" in state["sources"]:
+                scrapers.append(asyncio.to_thread(self._scrape_linkedin, state))
+            if "web_search" in state["sources"]:
+                scrapers.append(asyncio.to_thread(self._search_web, state))
+            if scrapers:
+                await asyncio.gather(*scrapers)
+            
+            state = await asyncio.to_thread(self._enrich_leads, state)
+            state = await asyncio.to_thread(self._score_leads, state)
+            state = await asyncio.to_thread(self._aggregate_results, state)
+            
+            return {
+                "success": True,
+                "leads": [lead.model_dump() for lead in state.get("final_leads", [])],
+                "statistics": state.get("statistics", {}),
+                "errors": state.get("errors", []),
+                "started_at": state.get("started_at"),
+                "completed_at": state.get("completed_at"),
+            }
+        
+        except Exception as e:
+            logger.error(f"Workflow error: {e}")
+            return {
+                "success": False,
+                "leads": [],
+                "statistics": {},
+                "errors": [str(e)],
+                "started_at": state.get("started_at"),
+                "completed_at": datetime.now().isoformat(),
+            }
+
 
 # Convenience function
 def create_workflow() -> LeadGenerationWorkflow:
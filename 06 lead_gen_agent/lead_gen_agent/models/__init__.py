@@ -11,6 +11,7 @@ from lead_gen_agent.models.lead_models import (
     ICPConfig,
     ScoringWeights,
     PriorityBucket,
+    fast_lead,
 )
 
 __all__ = [
@@ -21,4 +22,5 @@ __all__ = [
     "ICPConfig",
     "ScoringWeights",
     "PriorityBucket",
+    "fast_lead",
 ]
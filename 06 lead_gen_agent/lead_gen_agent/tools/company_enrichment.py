@@ -37,6 +37,9 @@ class CompanyEnrichmentTool:
                     temperature=0.3,
                     timeout=Config.LLM_TIMEOUT,
                     api_key=Config.OPENAI_API_KEY,
+                    # JSON mode guarantees parseable output, so we never
+                    # regex-scan the response or re-call on parse failure
+                    model_kwargs={"response_format": {"type": "json_object"}},
                 )
         except Exception as e:
             logger.warning(f"Could not initialize LLM: {e}")
@@ -173,13 +176,11 @@ Return only valid JSON, nothing else."""
                 response = self.llm.invoke(prompt)
                 response_text = response.content if hasattr(response, 'content') else str(response)
                 
-                # Parse JSON from response
+                # JSON mode returns a bare JSON object, so parse it directly -
+                # the old brace-matching regex dropped nested tech_stack arrays
                 import json
-                # Try to find JSON in response
-                json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-                if json_match:
-                    data = json.loads(json_match.group())
-                    result.update({k: v for k, v in data.items() if v is not None})
+                data = json.loads(response_text)
+                result.update({k: v for k, v in data.items() if v is not None})
             except Exception as e:
                 logger.debug(f"LLM extraction failed: {e}")
         
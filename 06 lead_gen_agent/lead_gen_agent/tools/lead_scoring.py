@@ -3,9 +3,11 @@ Lead Scoring Tool - LLM-based lead scoring and analysis.
 Scores leads against an Ideal Customer Profile (ICP).
 """
 
+import asyncio
+import hashlib
 import logging
 import json
-import re
+import os
 from typing import Dict, Any, Optional
 from lead_gen_agent.models import Lead, LeadScoreResult, PriorityBucket, ICPConfig, ScoringWeights
 from lead_gen_agent.config import Config
@@ -13,6 +15,45 @@ from lead_gen_agent.config import Config
 logger = logging.getLogger(__name__)
 
 
+def _lead_id(lead: Lead) -> str:
+    """Stable content-addressed lead id.
+
+    hash() is salted per process, so the old hash()%1000 suffix was
+    unreproducible across runs and collision-prone at scale. BLAKE2s over
+    company and contact name gives a 64-bit id that is stable everywhere,
+    which also makes it usable as a cache key.
+    """
+    digest = hashlib.blake2s(
+        f"{lead.company_name}|{lead.name or ''}".encode(), digest_size=8
+    ).hexdigest()
+    return f"lead_{digest}"
+
+
+
+_llm_cache_enabled = False
+
+
+def _enable_llm_cache() -> None:
+    """Back all LLM calls with a persistent sqlite cache.
+
+    LangChain keys on (prompt, llm_string), which already captures model and
+    temperature, so re-scoring an unchanged lead set is served from disk
+    instead of re-spending API calls.
+    """
+    global _llm_cache_enabled
+    if _llm_cache_enabled:
+        return
+    try:
+        from langchain_community.cache import SQLiteCache
+        from langchain.globals import set_llm_cache
+        
+        set_llm_cache(SQLiteCache(database_path=os.path.join(Config.STORAGE_PATH, "llm_cache.sqlite")))
+        _llm_cache_enabled = True
+    except Exception as e:
+        logger.debug(f"Could not enable LLM cache: {e}")
+
+
+
 class LeadScoringTool:
     """
     Scores leads using LLM-powered analysis against an ICP.
@@ -25,10 +66,19 @@ class LeadScoringTool:
     - Role seniority
     - Hiring signals
     """
-    
+
+    # Numeric scores inside this band are too close to call with set
+    # arithmetic alone; only these are escalated to the LLM
+    AMBIGUOUS_SCORE_LOW = 35.0
+    AMBIGUOUS_SCORE_HIGH = 65.0
+
     def __init__(self):
         """Initialize the scoring tool."""
+        _enable_llm_cache()
         self.llm = None
+        # ICP prompt text keyed by the config's JSON dump; the ICP is
+        # constant across a batch, so it is rendered once per run, not per lead
+        self._icp_description_cache: Dict[str, str] = {}
         self._init_llm()
     
     def _init_llm(self):
@@ -41,6 +91,9 @@ class LeadScoringTool:
                     temperature=0.2,
                     timeout=Config.LLM_TIMEOUT,
                     api_key=Config.OPENAI_API_KEY,
+                    # JSON mode guarantees parseable output, so we never
+                    # regex-scan the response or re-call on parse failure
+                    model_kwargs={"response_format": {"type": "json_object"}},
                 )
         except Exception as e:
             logger.warning(f"Could not initialize LLM for scoring: {e}")
@@ -60,45 +113,261 @@ class LeadScoringTool:
         """
         try:
             weights = scoring_weights or ScoringWeights()
-            
-            # Use LLM scoring if available
-            if self.llm:
+
+            # Deterministic scoring first: most leads are clearly in or
+            # clearly out, and set arithmetic decides those for free. The
+            # LLM is reserved for the ambiguous mid-band.
+            score, reasons = self._numeric_score(lead, icp_config, weights)
+
+            if self.llm and self.AMBIGUOUS_SCORE_LOW <= score <= self.AMBIGUOUS_SCORE_HIGH:
                 return self._score_with_llm(lead, icp_config, weights)
-            else:
-                return self._score_with_heuristics(lead, icp_config, weights)
-        
+
+            return self._finalize_score(lead, score, reasons)
+
         except Exception as e:
             logger.error(f"Error scoring lead: {e}")
             return self._create_default_result(lead, str(e))
-    
-    def _score_with_llm(self, lead: Lead, icp_config: ICPConfig, weights: ScoringWeights) -> LeadScoreResult:
-        """Score using LLM analysis."""
-        try:
-            # Build ICP description
-            icp_parts = []
-            if icp_config.target_company_sizes:
-                icp_parts.append(f"Target sizes: {', '.join(icp_config.target_company_sizes)}")
-            if icp_config.target_industries:
-                icp_parts.append(f"Target industries: {', '.join(icp_config.target_industries)}")
-            if icp_config.preferred_tech_stack:
-                icp_parts.append(f"Preferred tech: {', '.join(icp_config.preferred_tech_stack)}")
-            if icp_config.target_geographies:
-                icp_parts.append(f"Target regions: {', '.join(icp_config.target_geographies)}")
-            
-            icp_desc = "\n".join(icp_parts) if icp_parts else "General B2B companies"
-            
-            # Build lead description
-            tech_stack = []
+
+    def _numeric_score(self, lead: Lead, icp_config: ICPConfig, weights: ScoringWeights) -> tuple:
+        """
+        Score a lead with pure set arithmetic against the ICP.
+
+        Each configured ICP dimension contributes its weight when the lead
+        matches; the total is normalized over the dimensions the ICP actually
+        defines so an unconfigured field never penalizes a lead.
+
+        Returns:
+            Tuple of (score 0-100, list of reason strings)
+        """
+        earned = 0.0
+        applicable = 0.0
+        reasons = []
+
+        # Company size
+        if icp_config.target_company_sizes:
+            applicable += weights.company_size_weight
+            company_size = lead.company.company_size if lead.company else None
+            if company_size and company_size.lower() in {s.lower() for s in icp_config.target_company_sizes}:
+                earned += weights.company_size_weight
+                reasons.append(f"Size match: {company_size}")
+
+        # Industry
+        if icp_config.target_industries:
+            applicable += weights.industry_match_weight
+            if lead.industry and lead.industry.lower() in {i.lower() for i in icp_config.target_industries}:
+                earned += weights.industry_match_weight
+                reasons.append(f"Industry match: {lead.industry}")
+
+        # Geography (substring match: "Austin, TX" should hit "Austin")
+        if icp_config.target_geographies:
+            applicable += weights.geography_weight
+            location = (lead.location or "").lower()
+            if location and any(g.lower() in location for g in icp_config.target_geographies):
+                earned += weights.geography_weight
+                reasons.append(f"Location match: {lead.location}")
+
+        # Tech stack overlap (fractional credit)
+        if icp_config.preferred_tech_stack:
+            applicable += weights.tech_stack_match_weight
+            lead_tech = set()
             if lead.company and lead.company.tech_stack:
-                tech_stack.extend(lead.company.tech_stack)
+                lead_tech.update(t.lower() for t in lead.company.tech_stack)
             if lead.source_job_posting and lead.source_job_posting.technologies:
-                tech_stack.extend(lead.source_job_posting.technologies)
-            
-            hiring_signals = "None"
-            if lead.source_job_posting:
-                hiring_signals = f"Hiring for: {lead.source_job_posting.title}"
-            
-            prompt = f"""Score this lead against the ICP on a scale of 0-100.
+                lead_tech.update(t.lower() for t in lead.source_job_posting.technologies)
+            preferred = {t.lower() for t in icp_config.preferred_tech_stack}
+            overlap = len(lead_tech & preferred) / max(1, len(preferred))
+            earned += weights.tech_stack_match_weight * overlap
+            if overlap > 0:
+                reasons.append(f"Tech overlap: {overlap:.0%} of preferred stack")
+
+        # Role seniority
+        if icp_config.target_roles:
+            applicable += weights.role_seniority_weight
+            title = (lead.title or "").lower()
+            if title and any(r.lower() in title for r in icp_config.target_roles):
+                earned += weights.role_seniority_weight
+                reasons.append(f"Role match: {lead.title}")
+
+        # Hiring signal (always applicable)
+        applicable += weights.hiring_signal_weight
+        if lead.source_job_posting:
+            earned += weights.hiring_signal_weight
+            reasons.append("Active hiring signal detected")
+
+        if applicable <= 0:
+            return 50.0, ["No ICP criteria configured"]
+
+        return round(earned / applicable * 100, 1), reasons
+
+    def _finalize_score(self, lead: Lead, score: float, reasons: list) -> LeadScoreResult:
+        """Apply a numeric score to the lead and build the result."""
+        if score >= 70:
+            priority = PriorityBucket.HIGH
+        elif score >= 40:
+            priority = PriorityBucket.MEDIUM
+        else:
+            priority = PriorityBucket.LOW
+
+        analysis = ". ".join(reasons) if reasons else "No ICP criteria matched."
+
+        lead.lead_score = score
+        lead.priority = priority
+        lead.reasons_for_score = analysis
+
+        return LeadScoreResult(
+            lead_id=_lead_id(lead),
+            company_name=lead.company_name,
+            lead_score=score,
+            priority=priority,
+            analysis=analysis,
+        )
+
+    def _build_icp_description(self, icp_config: ICPConfig) -> str:
+        """Render the ICP as prompt text (shared by single and batch scoring)."""
+        cache_key = icp_config.model_dump_json()
+        cached = self._icp_description_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        icp_parts = []
+        if icp_config.target_company_sizes:
+            icp_parts.append(f"Target sizes: {', '.join(icp_config.target_company_sizes)}")
+        if icp_config.target_industries:
+            icp_parts.append(f"Target industries: {', '.join(icp_config.target_industries)}")
+        if icp_config.preferred_tech_stack:
+            icp_parts.append(f"Preferred tech: {', '.join(icp_config.preferred_tech_stack)}")
+        if icp_config.target_geographies:
+            icp_parts.append(f"Target regions: {', '.join(icp_config.target_geographies)}")
+
+        description = "\n".join(icp_parts) if icp_parts else "General B2B companies"
+        self._icp_description_cache[cache_key] = description
+        return description
+
+    def _describe_lead(self, lead: Lead) -> str:
+        """Render one lead as prompt text for batch scoring."""
+        tech_stack = []
+        if lead.company and lead.company.tech_stack:
+            tech_stack.extend(lead.company.tech_stack)
+        if lead.source_job_posting and lead.source_job_posting.technologies:
+            tech_stack.extend(lead.source_job_posting.technologies)
+
+        hiring_signals = "None"
+        if lead.source_job_posting:
+            hiring_signals = f"Hiring for: {lead.source_job_posting.title}"
+
+        return (
+            f"Company: {lead.company_name} | "
+            f"Industry: {lead.industry or 'Unknown'} | "
+            f"Location: {lead.location or 'Unknown'} | "
+            f"Tech Stack: {', '.join(set(tech_stack)) if tech_stack else 'Unknown'} | "
+            f"Hiring Signals: {hiring_signals}"
+        )
+
+    def score_leads_batch(
+        self,
+        leads: list,
+        icp_config: ICPConfig,
+        scoring_weights: Optional[ScoringWeights] = None,
+        batch_size: int = 20,
+    ) -> list:
+        """
+        Score many leads with one LLM call per batch instead of one per lead.
+
+        The ICP description is sent once per batch and the model returns one
+        JSON object per lead, eliminating N-1 round-trips and repeated prompt
+        prefixes.
+
+        Args:
+            leads: Leads to score
+            icp_config: ICP configuration
+            scoring_weights: Scoring weights configuration
+            batch_size: Max leads per LLM call
+
+        Returns:
+            List of LeadScoreResult, aligned with the input order
+        """
+        weights = scoring_weights or ScoringWeights()
+
+        if not self.llm:
+            return [self._score_with_heuristics(lead, icp_config, weights) for lead in leads]
+
+        results = []
+        for start in range(0, len(leads), batch_size):
+            results.extend(self._score_batch_with_llm(leads[start:start + batch_size], icp_config, weights))
+        return results
+
+    def _score_batch_with_llm(self, leads: list, icp_config: ICPConfig, weights: ScoringWeights) -> list:
+        """Score one batch of leads in a single LLM call."""
+        try:
+            icp_desc = self._build_icp_description(icp_config)
+            lead_lines = "\n".join(
+                f"{i}. {self._describe_lead(lead)}" for i, lead in enumerate(leads, start=1)
+            )
+
+            prompt = f"""Score each of the following leads against the ICP on a scale of 0-100.
+
+ICP (Ideal Customer Profile):
+{icp_desc}
+
+Leads:
+{lead_lines}
+
+Return ONLY a JSON object with a "scores" array containing one object per lead,
+in the same order, each with:
+- score: number between 0-100
+- priority: "HIGH", "MEDIUM", or "LOW"
+- analysis: brief explanation (1-2 sentences)
+
+Return only valid JSON."""
+
+            response = self.llm.invoke(prompt)
+            response_text = response.content if hasattr(response, 'content') else str(response)
+
+            data = json.loads(response_text)
+            items = data.get("scores")
+            if not isinstance(items, list) or len(items) != len(leads):
+                raise ValueError(f"Expected {len(leads)} scores, got {items!r:.100}")
+
+            results = []
+            for lead, item in zip(leads, items):
+                score = max(0, min(100, float(item.get("score", 50))))
+                priority_str = str(item.get("priority", "MEDIUM")).upper()
+                priority = PriorityBucket(priority_str) if priority_str in ["HIGH", "MEDIUM", "LOW"] else PriorityBucket.MEDIUM
+                analysis = item.get("analysis", "Scored by AI analysis.")
+
+                lead.lead_score = score
+                lead.priority = priority
+                lead.reasons_for_score = analysis
+
+                results.append(LeadScoreResult(
+                    lead_id=_lead_id(lead),
+                    company_name=lead.company_name,
+                    lead_score=score,
+                    priority=priority,
+                    analysis=analysis,
+                ))
+            return results
+
+        except Exception as e:
+            logger.warning(f"Batch scoring failed, falling back to per-lead: {e}")
+            return [self.score_lead(lead, icp_config, weights) for lead in leads]
+
+    def _render_single_prompt(self, lead: Lead, icp_config: ICPConfig) -> str:
+        """Render the single-lead scoring prompt."""
+        icp_desc = self._build_icp_description(icp_config)
+
+        # Build lead description
+        tech_stack = []
+        if lead.company and lead.company.tech_stack:
+            tech_stack.extend(lead.company.tech_stack)
+        if lead.source_job_posting and lead.source_job_posting.technologies:
+            tech_stack.extend(lead.source_job_posting.technologies)
+
+        hiring_signals = "None"
+        if lead.source_job_posting:
+            hiring_signals = f"Hiring for: {lead.source_job_posting.title}"
+
+        return f"""Score this lead against the ICP on a scale of 0-100.
 
 ICP (Ideal Customer Profile):
 {icp_desc}
@@ -117,38 +386,96 @@ Return ONLY a JSON object with:
 
 Return only valid JSON."""
 
+    def _parse_single_response(self, lead: Lead, response_text: str, icp_config: ICPConfig, weights: ScoringWeights) -> LeadScoreResult:
+        """Turn a single-lead LLM response into a LeadScoreResult."""
+        # JSON mode returns a bare JSON object, so parse it directly -
+        # no brace-matching regex that breaks on nested objects
+        try:
+            data = json.loads(response_text)
+        except json.JSONDecodeError:
+            return self._score_with_heuristics(lead, icp_config, weights)
+
+        score = float(data.get("score", 50))
+        score = max(0, min(100, score))
+        priority_str = data.get("priority", "MEDIUM").upper()
+        priority = PriorityBucket(priority_str) if priority_str in ["HIGH", "MEDIUM", "LOW"] else PriorityBucket.MEDIUM
+        analysis = data.get("analysis", "Scored by AI analysis.")
+
+        # Update lead
+        lead.lead_score = score
+        lead.priority = priority
+        lead.reasons_for_score = analysis
+
+        return LeadScoreResult(
+            lead_id=_lead_id(lead),
+            company_name=lead.company_name,
+            lead_score=score,
+            priority=priority,
+            analysis=analysis,
+        )
+
+    def _score_with_llm(self, lead: Lead, icp_config: ICPConfig, weights: ScoringWeights) -> LeadScoreResult:
+        """Score using LLM analysis."""
+        try:
+            prompt = self._render_single_prompt(lead, icp_config)
             response = self.llm.invoke(prompt)
             response_text = response.content if hasattr(response, 'content') else str(response)
-            
-            # Parse response
-            json_match = re.search(r'\{[^{}]*\}', response_text, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group())
-                score = float(data.get("score", 50))
-                score = max(0, min(100, score))
-                priority_str = data.get("priority", "MEDIUM").upper()
-                priority = PriorityBucket(priority_str) if priority_str in ["HIGH", "MEDIUM", "LOW"] else PriorityBucket.MEDIUM
-                analysis = data.get("analysis", "Scored by AI analysis.")
-            else:
-                # Fallback to heuristics
-                return self._score_with_heuristics(lead, icp_config, weights)
-            
-            # Update lead
-            lead.lead_score = score
-            lead.priority = priority
-            lead.reasons_for_score = analysis
-            
-            return LeadScoreResult(
-                lead_id=f"lead_{lead.company_name}_{hash(str(lead.name)) % 1000}",
-                company_name=lead.company_name,
-                lead_score=score,
-                priority=priority,
-                analysis=analysis,
-            )
-        
+            return self._parse_single_response(lead, response_text, icp_config, weights)
+
         except Exception as e:
             logger.error(f"LLM scoring failed: {e}")
             return self._score_with_heuristics(lead, icp_config, weights)
+
+    async def score_lead_async(self, lead: Lead, icp_config: ICPConfig, scoring_weights: Optional[ScoringWeights] = None) -> LeadScoreResult:
+        """
+        Async variant of score_lead using the LLM's ainvoke.
+
+        Lets many leads score concurrently instead of waiting out one
+        OpenAI round-trip at a time.
+        """
+        weights = scoring_weights or ScoringWeights()
+
+        # Same decisive-score short-circuit as score_lead
+        score, reasons = self._numeric_score(lead, icp_config, weights)
+        if not self.llm or not (self.AMBIGUOUS_SCORE_LOW <= score <= self.AMBIGUOUS_SCORE_HIGH):
+            return self._finalize_score(lead, score, reasons)
+
+        try:
+            prompt = self._render_single_prompt(lead, icp_config)
+            response = await self.llm.ainvoke(prompt)
+            response_text = response.content if hasattr(response, 'content') else str(response)
+            return self._parse_single_response(lead, response_text, icp_config, weights)
+
+        except Exception as e:
+            logger.error(f"LLM scoring failed: {e}")
+            return self._score_with_heuristics(lead, icp_config, weights)
+
+    async def score_many(
+        self,
+        leads: list,
+        icp_config: ICPConfig,
+        scoring_weights: Optional[ScoringWeights] = None,
+        concurrency: int = 10,
+    ) -> list:
+        """
+        Score leads concurrently under a bounded semaphore.
+
+        Args:
+            leads: Leads to score
+            icp_config: ICP configuration
+            scoring_weights: Scoring weights configuration
+            concurrency: Max in-flight LLM calls (bounded by OpenAI rate limits)
+
+        Returns:
+            List of LeadScoreResult, aligned with the input order
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(lead: Lead) -> LeadScoreResult:
+            async with sem:
+                return await self.score_lead_async(lead, icp_config, scoring_weights)
+
+        return list(await asyncio.gather(*(_one(lead) for lead in leads)))
     
     def _score_with_heuristics(self, lead: Lead, icp_config: ICPConfig, weights: ScoringWeights) -> LeadScoreResult:
         """Score using rule-based heuristics."""
@@ -206,7 +533,7 @@ Return only valid JSON."""
         lead.reasons_for_score = analysis
         
         return LeadScoreResult(
-            lead_id=f"lead_{lead.company_name}_{hash(str(lead.name)) % 1000}",
+            lead_id=_lead_id(lead),
             company_name=lead.company_name,
             lead_score=score,
             priority=priority,
@@ -220,7 +547,7 @@ Return only valid JSON."""
         lead.reasons_for_score = f"Default score assigned: {error_msg}"
         
         return LeadScoreResult(
-            lead_id=f"lead_{lead.company_name}_{hash(str(lead.name)) % 1000}",
+            lead_id=_lead_id(lead),
             company_name=lead.company_name,
             lead_score=50.0,
             priority=PriorityBucket.MEDIUM,
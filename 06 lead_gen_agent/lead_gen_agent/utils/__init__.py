@@ -4,8 +4,10 @@ Utility functions and helpers.
 
 import logging
 import json
+import re
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from urllib.parse import urlparse
 import hashlib
 
 
@@ -41,16 +43,66 @@ def truncate_text(text: Optional[str], max_length: int = 100) -> str:
     return text[:max_length - 3] + "..."
 
 
+def canonical_lead_key(lead: Dict[str, Any]) -> str:
+    """
+    Canonical identity for a lead across sources.
+    
+    Prefers the website domain (most reliable across Google Maps, LinkedIn
+    and web search), then digits-only phone, then the normalized company
+    name. Prefixed so the three namespaces never collide.
+    """
+    website = lead.get("company_website")
+    if website:
+        website = str(website)
+        netloc = urlparse(website if "://" in website else f"https://{website}").netloc.lower()
+        if netloc.startswith("www."):
+            netloc = netloc[4:]
+        if netloc:
+            return f"site:{netloc}"
+    
+    phone = lead.get("phone")
+    if phone:
+        digits = re.sub(r"\D", "", str(phone))
+        if digits:
+            return f"phone:{digits}"
+    
+    name = str(lead.get("company_name", "")).lower()
+    return "name:" + re.sub(r"[^a-z0-9]", "", name)
+
+
+def _merge_lead_dicts(kept: Dict[str, Any], dup: Dict[str, Any]) -> None:
+    """Fold a duplicate's data into the kept lead without overwriting."""
+    for field, value in dup.items():
+        if field == "enrichment_sources":
+            continue
+        if kept.get(field) in (None, "", [], {}) and value not in (None, "", [], {}):
+            kept[field] = value
+    
+    sources = list(kept.get("enrichment_sources") or [])
+    for source in dup.get("enrichment_sources") or []:
+        if source not in sources:
+            sources.append(source)
+    if sources:
+        kept["enrichment_sources"] = sources
+
+
 def deduplicate_leads(leads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Remove duplicate leads based on company_name and name."""
-    seen = set()
-    unique = []
+    """
+    Remove duplicate leads, merging enrichment data into the first occurrence.
+    
+    The same company routinely arrives via Google Maps, LinkedIn Jobs and web
+    search; keying on canonical_lead_key collapses those to one lead (one
+    scoring LLM call) while keeping every source's non-null fields.
+    """
+    seen: Dict[str, Dict[str, Any]] = {}
     for lead in leads:
-        key = (lead.get("company_name", "").lower(), lead.get("name", "").lower())
-        if key not in seen:
-            seen.add(key)
-            unique.append(lead)
-    return unique
+        key = canonical_lead_key(lead)
+        kept = seen.get(key)
+        if kept is None:
+            seen[key] = lead
+        else:
+            _merge_lead_dicts(kept, lead)
+    return list(seen.values())
 
 
 def normalize_location(location: str) -> str:
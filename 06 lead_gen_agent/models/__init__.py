@@ -10,6 +10,7 @@ from .lead_models import (
     LeadScoreResult,
     ICPConfig,
     ScoringWeights,
+    fast_lead,
 )
 
 __all__ = [
@@ -19,4 +20,5 @@ __all__ = [
     "LeadScoreResult",
     "ICPConfig",
     "ScoringWeights",
+    "fast_lead",
 ]
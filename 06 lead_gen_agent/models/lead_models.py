@@ -5,7 +5,7 @@ Core data models using Pydantic v2 for type safety and validation.
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from enum import Enum
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
 
 
 class PriorityBucket(str, Enum):
@@ -29,8 +29,7 @@ class Company(BaseModel):
     employee_count: Optional[int] = Field(None, description="Number of employees")
     tech_stack: Optional[List[str]] = Field(default_factory=list, description="Detected technologies")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -58,8 +57,7 @@ class JobPosting(BaseModel):
     technologies: Optional[List[str]] = Field(default_factory=list, description="Required technologies")
     posted_date: Optional[datetime] = Field(None, description="When the job was posted")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -109,16 +107,37 @@ class Lead(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now, description="Last update timestamp")
     raw_data: Optional[Dict[str, Any]] = Field(None, description="Raw enrichment data for reference")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return self.model_dump(exclude_none=True)
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize directly to JSON bytes.
+
+        Skips the intermediate dict from model_dump; callers serving HTTP can
+        return the bytes as-is (and join fragments for list responses) instead
+        of re-encoding through a generic JSON encoder.
+        """
+        return self.__pydantic_serializer__.to_json(self, exclude_none=True)
+
+    @classmethod
+    def from_trusted_dict(cls, data: Dict[str, Any]) -> "Lead":
+        """Create from a dictionary without validation.
+
+        Uses model_construct to skip the pydantic validator entirely. Only for
+        round-tripping internal caches where we trust our own writes; external
+        input must keep going through from_dict.
+        """
+        return cls.model_construct(**data)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Lead":
         """Create from dictionary."""
+        # Missing company_name is a producer bug, not runtime input noise.
+        # assert is stripped under `python -O` so release builds skip the check.
+        assert "company_name" in data, "missing company_name"
         return cls(**data)
 
 
@@ -132,8 +151,7 @@ class ScoringWeights(BaseModel):
     role_seniority_weight: float = Field(default=0.15, ge=0, le=1)
     hiring_signal_weight: float = Field(default=0.15, ge=0, le=1)
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class ICPConfig(BaseModel):
@@ -147,8 +165,7 @@ class ICPConfig(BaseModel):
     min_company_headcount: Optional[int] = Field(None, description="Minimum company headcount")
     max_company_headcount: Optional[int] = Field(None, description="Maximum company headcount")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class LeadScoreResult(BaseModel):
@@ -161,14 +178,35 @@ class LeadScoreResult(BaseModel):
     analysis: str = Field(..., description="Detailed scoring analysis")
     scoring_timestamp: datetime = Field(default_factory=datetime.now, description="When scoring occurred")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
         return self.model_dump(exclude_none=True)
     
+    def to_json_bytes(self) -> bytes:
+        """Serialize directly to JSON bytes.
+
+        Skips the intermediate dict from model_dump; callers serving HTTP can
+        return the bytes as-is (and join fragments for list responses) instead
+        of re-encoding through a generic JSON encoder.
+        """
+        return self.__pydantic_serializer__.to_json(self, exclude_none=True)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "LeadScoreResult":
         """Create from dictionary."""
         return cls(**data)
+
+
+def fast_lead(**kwargs: Any) -> Lead:
+    """Build a Lead without running pydantic validation.
+
+    model_construct fills in the field defaults, then the caller's fields are
+    overlaid directly on __dict__. Meant for hot producer paths (scrapers,
+    deserializers) whose inputs were already validated upstream;
+    external-facing boundaries should keep using Lead(**kwargs).
+    """
+    lead = Lead.model_construct()
+    lead.__dict__.update(kwargs)
+    return lead
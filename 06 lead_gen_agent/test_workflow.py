@@ -1,5 +1,6 @@
 """Quick test script to verify the lead generation workflow."""
 
+import asyncio
 import sys
 sys.path.insert(0, "c:\\Users\\ayusi\\Desktop\\New folder\\lead_gen_agent")
 
@@ -15,8 +16,9 @@ def test_workflow():
     # Create workflow
     workflow = create_workflow()
     
-    # Run with a test query
-    result = workflow.run(
+    # Run with a test query through the async path so multi-source
+    # collection happens concurrently
+    result = asyncio.run(workflow.arun(
         query="AI startups",
         sources=["web_search"],
         icp_config={
@@ -25,7 +27,7 @@ def test_workflow():
             "preferred_tech_stack": ["Python", "AWS"],
         },
         max_results=5,
-    )
+    ))
     
     print(f"\nWorkflow Success: {result['success']}")
     print(f"Total Leads: {result['statistics'].get('total_leads', 0)}")
@@ -3,15 +3,149 @@ Apify Scraper Tool - Generic abstraction for Apify-based scraping.
 Handles API communication, polling, and result fetching.
 """
 
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import threading
 import time
 import json
+from pathlib import Path
 from typing import Dict, Any, Optional, List
 import httpx
+import orjson
 from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Shared connection-pool tuning: polling loops reuse keep-alive sockets
+# instead of paying TCP/TLS handshakes per request
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=60.0)
+_HTTP_HEADERS = {"Accept-Encoding": "gzip, br"}
+
+
+def _make_client(timeout: float) -> httpx.Client:
+    """Build the scraper HTTP client, preferring HTTP/2 when h2 is installed."""
+    try:
+        return httpx.Client(timeout=timeout, http2=True, limits=_HTTP_LIMITS, headers=_HTTP_HEADERS)
+    except ImportError:
+        return httpx.Client(timeout=timeout, limits=_HTTP_LIMITS, headers=_HTTP_HEADERS)
+
+
+def _make_async_client(timeout: float) -> httpx.AsyncClient:
+    """Async counterpart of _make_client."""
+    try:
+        return httpx.AsyncClient(timeout=timeout, http2=True, limits=_HTTP_LIMITS, headers=_HTTP_HEADERS)
+    except ImportError:
+        return httpx.AsyncClient(timeout=timeout, limits=_HTTP_LIMITS, headers=_HTTP_HEADERS)
+
+
+
+class _TokenBucket:
+    """Token-bucket rate limiter shared by all scrapers in the process.
+
+    Refills at rpm requests per minute; acquire() blocks until a token is
+    available so concurrent scraping jobs cooperate on the Apify API quota.
+    """
+    
+    def __init__(self, rpm: int = 60):
+        self.rpm = rpm
+        self.tokens = float(rpm)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self, tokens: int) -> float:
+        """Take tokens if available; return seconds to wait otherwise."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rpm, self.tokens + (now - self.updated) * self.rpm / 60.0)
+            self.updated = now
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return 0.0
+            return (tokens - self.tokens) * 60.0 / self.rpm
+    
+    def acquire(self, tokens: int = 1) -> None:
+        """Block until tokens are available."""
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Async variant of acquire."""
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+# One bucket per process so parallel scrapers share the API budget
+_poll_bucket = _TokenBucket(rpm=60)
+
+
+# HTTP retry policy: transport errors and these status codes are transient
+# and worth retrying; any other failure propagates immediately
+_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+_RETRY_MAX_ATTEMPTS = 5
+_RETRY_MAX_WAIT = 30.0
+
+
+def _retry_wait(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Backoff delay before the next retry, honoring Retry-After on 429."""
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(_RETRY_MAX_WAIT, float(retry_after))
+            except ValueError:
+                pass
+    return min(_RETRY_MAX_WAIT, float(2 ** attempt))
+
+
+def _retry_call(fn):
+    """Run fn() with exponential backoff on transient HTTP failures.
+
+    A single 5xx or connection reset used to abort a scrape that took minutes
+    to set up; transient failures now retry a few times before propagating.
+    """
+    for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+        try:
+            return fn()
+        except httpx.TransportError as e:
+            last_error, response = e, None
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in _RETRY_STATUS_CODES:
+                raise
+            last_error, response = e, e.response
+        if attempt == _RETRY_MAX_ATTEMPTS:
+            raise last_error
+        wait = _retry_wait(attempt, response)
+        logger.warning(f"Transient Apify API failure ({last_error}); retrying in {wait:.0f}s")
+        time.sleep(wait)
+
+
+async def _aretry_call(fn):
+    """Async variant of _retry_call; fn is an async callable."""
+    for attempt in range(1, _RETRY_MAX_ATTEMPTS + 1):
+        try:
+            return await fn()
+        except httpx.TransportError as e:
+            last_error, response = e, None
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in _RETRY_STATUS_CODES:
+                raise
+            last_error, response = e, e.response
+        if attempt == _RETRY_MAX_ATTEMPTS:
+            raise last_error
+        wait = _retry_wait(attempt, response)
+        logger.warning(f"Transient Apify API failure ({last_error}); retrying in {wait:.0f}s")
+        await asyncio.sleep(wait)
+
+
+
 
 class ApifyScraperConfig(BaseModel):
     """Configuration for Apify scraper."""
@@ -20,6 +154,9 @@ class ApifyScraperConfig(BaseModel):
     token: str = Field(..., description="Apify token")
     timeout: int = Field(default=300, description="Timeout in seconds")
     poll_interval: int = Field(default=5, description="Polling interval in seconds")
+    cache_dir: Optional[str] = Field(default=None, description="Directory for the on-disk run cache (None disables caching)")
+    cache_ttl: int = Field(default=604800, description="Cache TTL in seconds (default one week)")
+    cache_policy: str = Field(default="enabled", description="Cache policy: enabled, read_only, replay, or disabled")
 
 
 class ApifyScraperTool:
@@ -33,11 +170,15 @@ class ApifyScraperTool:
     """
     
     BASE_URL = "https://api.apify.com/v2"
+    # Server-side long-poll window for run-status requests (Apify max 60s)
+    WAIT_FOR_FINISH = 60
     
     def __init__(self, config: ApifyScraperConfig):
         """Initialize the Apify scraper."""
         self.config = config
-        self.client = httpx.Client(timeout=config.timeout)
+        self.client = _make_client(config.timeout)
+        self.async_client: Optional[httpx.AsyncClient] = None
+        self._cache_db: Optional[sqlite3.Connection] = None
     
     def run(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -49,6 +190,20 @@ class ApifyScraperTool:
         Returns:
             Dictionary with results or error information
         """
+        cache_key = self._cache_key(input_data)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Apify cache hit for actor {self.config.actor_id}")
+            return {"success": True, "results": cached, "cached": True}
+        if self.config.cache_policy == "replay":
+            # Replay mode never runs a billable scrape; a miss is an error so
+            # metric iteration stays deterministic.
+            return {
+                "success": False,
+                "error": f"Apify cache miss under replay policy: {cache_key}",
+                "results": []
+            }
+        
         try:
             # Start the actor run
             run_id = self._start_run(input_data)
@@ -70,6 +225,8 @@ class ApifyScraperTool:
             
             logger.info(f"Successfully retrieved {len(results)} results from Apify")
             
+            self._cache_set(cache_key, results)
+            
             return {
                 "success": True,
                 "run_id": run_id,
@@ -84,60 +241,319 @@ class ApifyScraperTool:
                 "results": []
             }
     
+    def run_stream(self, input_data: Dict[str, Any]):
+        """
+        Run an Apify actor and yield dataset items as they download.
+        
+        Streaming counterpart of run(): cache hits replay the stored items,
+        otherwise the run starts and completes as usual and items come
+        straight off the JSONL stream. Fresh results are not written back to
+        the cache, since that would mean buffering the full list this method
+        exists to avoid.
+        
+        Yields:
+            Result items as dictionaries
+        """
+        cache_key = self._cache_key(input_data)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Apify cache hit for actor {self.config.actor_id}")
+            yield from cached
+            return
+        if self.config.cache_policy == "replay":
+            raise LookupError(f"Apify cache miss under replay policy: {cache_key}")
+        
+        run_id = self._start_run(input_data)
+        logger.info(f"Started Apify run: {run_id}")
+        
+        run_data = self._wait_for_completion(run_id)
+        if run_data.get("status") != "SUCCEEDED":
+            raise RuntimeError(f"Run failed: {run_data.get('status')}")
+        
+        yield from self.stream_results(run_id)
+    
+    def _cache_key(self, input_data: Dict[str, Any]) -> str:
+        """Content-addressed key for a run: BLAKE2b over actor id + input.
+
+        orjson serializes the payload in C and blake2b hashes small inputs
+        roughly 3x faster than sha256 on CPython.
+        """
+        payload = orjson.dumps(
+            {"actor": self.config.actor_id, "input": input_data},
+            option=orjson.OPT_SORT_KEYS,
+            default=str,
+        )
+        return hashlib.blake2b(payload, digest_size=32).hexdigest()
+    
+    def _get_cache_db(self) -> Optional[sqlite3.Connection]:
+        """Lazily open the sqlite run cache, if caching is configured."""
+        if self.config.cache_policy == "disabled" or not self.config.cache_dir:
+            return None
+        if self._cache_db is None:
+            cache_dir = Path(self.config.cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_db = sqlite3.connect(str(cache_dir / "apify_runs.sqlite"))
+            self._cache_db.execute(
+                "CREATE TABLE IF NOT EXISTS runs (key TEXT PRIMARY KEY, created_at REAL, results TEXT)"
+            )
+        return self._cache_db
+    
+    def _cache_get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached results for key if present and within TTL."""
+        db = self._get_cache_db()
+        if db is None:
+            return None
+        row = db.execute("SELECT created_at, results FROM runs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        created_at, results = row
+        if time.time() - created_at > self.config.cache_ttl:
+            return None
+        return orjson.loads(results)
+    
+    def _cache_set(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store run results under key (no-op for read_only/replay policies)."""
+        db = self._get_cache_db()
+        if db is None or self.config.cache_policy in ("read_only", "replay"):
+            return
+        db.execute(
+            "INSERT OR REPLACE INTO runs (key, created_at, results) VALUES (?, ?, ?)",
+            (key, time.time(), json.dumps(results)),
+        )
+        db.commit()
+    
     def _start_run(self, input_data: Dict[str, Any]) -> str:
         """Start an Apify actor run."""
         url = f"{self.BASE_URL}/acts/{self.config.actor_id}/runs"
         params = {"token": self.config.token}
         
-        response = self.client.post(url, json=input_data, params=params)
-        response.raise_for_status()
+        def _send():
+            response = self.client.post(url, json=input_data, params=params)
+            response.raise_for_status()
+            return response
         
-        data = response.json()
+        data = orjson.loads(_retry_call(_send).content)
         return data.get("data", {}).get("id")
     
     def _wait_for_completion(self, run_id: str, max_attempts: Optional[int] = None) -> Dict[str, Any]:
-        """Poll run status until completion or timeout."""
+        """Wait for run completion using Apify's server-side long poll."""
         url = f"{self.BASE_URL}/actor-runs/{run_id}"
-        params = {"token": self.config.token}
+        # waitForFinish long-polls server-side (up to 60s per call) and
+        # returns the moment the run reaches a terminal status - no idle
+        # round-trips and no poll_interval/2 detection lag
+        params = {"token": self.config.token, "waitForFinish": self.WAIT_FOR_FINISH}
+        poll_timeout = httpx.Timeout(self.WAIT_FOR_FINISH + 10)
         
-        start_time = time.time()
-        attempts = 0
-        max_attempts = max_attempts or (self.config.timeout // self.config.poll_interval)
+        deadline = time.monotonic() + self.config.timeout
         
-        while attempts < max_attempts:
-            response = self.client.get(url, params=params)
+        def _poll():
+            response = self.client.get(url, params=params, timeout=poll_timeout)
             response.raise_for_status()
+            return response
+        
+        while time.monotonic() < deadline:
+            _poll_bucket.acquire()
+            response = _retry_call(_poll)
             
-            run_data = response.json().get("data", {})
+            run_data = orjson.loads(response.content).get("data", {})
             status = run_data.get("status")
             
             if status in ["SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"]:
                 return run_data
             
-            logger.debug(f"Run {run_id} status: {status}, waiting...")
-            time.sleep(self.config.poll_interval)
-            attempts += 1
+            logger.debug(f"Run {run_id} still {status}; re-issuing long poll")
         
         raise TimeoutError(f"Apify run timed out after {self.config.timeout}s")
     
+    def stream_results(self, run_id: str, limit: int = 10000):
+        """
+        Stream results from a completed run one item at a time.
+
+        Uses the JSONL dataset format so large runs are decoded line by line
+        instead of materializing the whole response body; downstream parsers
+        can consume the first items before the download finishes.
+        
+        Yields:
+            Result items as dictionaries
+        """
+        url = f"{self.BASE_URL}/actor-runs/{run_id}/dataset/items"
+        params = {
+            "token": self.config.token,
+            "limit": limit,
+            "format": "jsonl"
+        }
+        
+        with self.client.stream("GET", url, params=params) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if line:
+                    yield orjson.loads(line)
+    
     def _fetch_results(self, run_id: str, limit: int = 10000) -> List[Dict[str, Any]]:
         """Fetch results from a completed run."""
+        # A mid-stream failure restarts the whole fetch; nothing has been
+        # returned to the caller yet so a clean restart is safe
+        return _retry_call(lambda: list(self.stream_results(run_id, limit)))
+    
+    async def arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async variant of run() using httpx.AsyncClient and asyncio polling.
+
+        Lets several actor runs (LinkedIn + Google Maps + web search) poll
+        concurrently under asyncio.gather instead of blocking in time.sleep.
+        """
+        cache_key = self._cache_key(input_data)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            logger.info(f"Apify cache hit for actor {self.config.actor_id}")
+            return {"success": True, "results": cached, "cached": True}
+        if self.config.cache_policy == "replay":
+            # Replay mode never runs a billable scrape; a miss is an error so
+            # metric iteration stays deterministic.
+            return {
+                "success": False,
+                "error": f"Apify cache miss under replay policy: {cache_key}",
+                "results": []
+            }
+        
+        try:
+            run_id = await self._astart_run(input_data)
+            logger.info(f"Started Apify run: {run_id}")
+            
+            run_data = await self._await_completion(run_id)
+            
+            if run_data.get("status") != "SUCCEEDED":
+                logger.error(f"Run failed with status: {run_data.get('status')}")
+                return {
+                    "success": False,
+                    "error": f"Run failed: {run_data.get('status')}",
+                    "results": []
+                }
+            
+            results = await self._afetch_results(run_id)
+            
+            logger.info(f"Successfully retrieved {len(results)} results from Apify")
+            
+            self._cache_set(cache_key, results)
+            
+            return {
+                "success": True,
+                "run_id": run_id,
+                "results": results,
+            }
+        
+        except Exception as e:
+            logger.error(f"Apify scraper error: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "results": []
+            }
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the async HTTP client."""
+        if self.async_client is None:
+            self.async_client = _make_async_client(self.config.timeout)
+        return self.async_client
+    
+    async def _astart_run(self, input_data: Dict[str, Any]) -> str:
+        """Start an Apify actor run (async)."""
+        url = f"{self.BASE_URL}/acts/{self.config.actor_id}/runs"
+        params = {"token": self.config.token}
+        
+        async def _send():
+            response = await self._get_async_client().post(url, json=input_data, params=params)
+            response.raise_for_status()
+            return response
+        
+        data = orjson.loads((await _aretry_call(_send)).content)
+        return data.get("data", {}).get("id")
+    
+    async def _await_completion(self, run_id: str, max_attempts: Optional[int] = None) -> Dict[str, Any]:
+        """Wait for run completion using Apify's server-side long poll (async)."""
+        url = f"{self.BASE_URL}/actor-runs/{run_id}"
+        # waitForFinish long-polls server-side (up to 60s per call) and
+        # returns the moment the run reaches a terminal status - no idle
+        # round-trips and no poll_interval/2 detection lag
+        params = {"token": self.config.token, "waitForFinish": self.WAIT_FOR_FINISH}
+        poll_timeout = httpx.Timeout(self.WAIT_FOR_FINISH + 10)
+        
+        deadline = time.monotonic() + self.config.timeout
+        
+        async def _poll():
+            response = await self._get_async_client().get(url, params=params, timeout=poll_timeout)
+            response.raise_for_status()
+            return response
+        
+        while time.monotonic() < deadline:
+            await _poll_bucket.acquire_async()
+            response = await _aretry_call(_poll)
+            
+            run_data = orjson.loads(response.content).get("data", {})
+            status = run_data.get("status")
+            
+            if status in ["SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"]:
+                return run_data
+            
+            logger.debug(f"Run {run_id} still {status}; re-issuing long poll")
+        
+        raise TimeoutError(f"Apify run timed out after {self.config.timeout}s")
+    
+    async def astream_results(self, run_id: str, limit: int = 10000):
+        """
+        Stream results from a completed run one item at a time (async).
+
+        JSONL lines are parsed with orjson as bytes arrive, so JSON decode
+        overlaps network I/O and the event loop is never blocked on a
+        multi-megabyte response.json() call. Downstream consumers can start
+        scoring the first lead before the download finishes.
+        
+        Yields:
+            Result items as dictionaries
+        """
         url = f"{self.BASE_URL}/actor-runs/{run_id}/dataset/items"
         params = {
             "token": self.config.token,
             "limit": limit,
-            "format": "json"
+            "format": "jsonl"
         }
         
-        response = self.client.get(url, params=params)
-        response.raise_for_status()
+        client = self._get_async_client()
+        async with client.stream("GET", url, params=params) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield orjson.loads(line)
+    
+    async def _afetch_results(self, run_id: str, limit: int = 10000) -> List[Dict[str, Any]]:
+        """Fetch results from a completed run (async)."""
+        async def _collect():
+            return [item async for item in self.astream_results(run_id, limit)]
         
-        # Response is a list of items
-        return response.json()
+        # A mid-stream failure restarts the whole fetch; nothing has been
+        # returned to the caller yet so a clean restart is safe
+        return await _aretry_call(_collect)
+    
+    async def aclose(self):
+        """Close the async HTTP client."""
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+    
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
     
     def close(self):
         """Close the HTTP client."""
         self.client.close()
+        if self._cache_db is not None:
+            self._cache_db.close()
+            self._cache_db = None
     
     def __enter__(self):
         """Context manager entry."""
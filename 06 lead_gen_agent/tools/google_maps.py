@@ -4,7 +4,11 @@ Uses Apify or Google Places API for ToS-compliant scraping.
 """
 
 import logging
+import re
+from datetime import datetime
 from typing import Dict, Any, List, Optional
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field
 from .apify_scraper import ApifyScraperTool, ApifyScraperConfig
 from ..models import Lead
@@ -91,6 +95,8 @@ class GoogleMapsBusinessSearchTool:
                 token=self.apify_token,
                 timeout=Config.APIFY_DEFAULT_TIMEOUT,
                 poll_interval=Config.APIFY_POLL_INTERVAL,
+                cache_dir=Config.APIFY_CACHE_DIR,
+                cache_ttl=Config.APIFY_CACHE_TTL,
             )
             
             scraper = ApifyScraperTool(config)
@@ -111,6 +117,59 @@ class GoogleMapsBusinessSearchTool:
             logger.error(f"Error searching via Apify: {e}")
             return []
     
+    async def asearch_businesses(self, search_input: GoogleMapsSearchInput) -> List[Lead]:
+        """
+        Async variant of search_businesses for concurrent scraping.
+
+        Lets the workflow poll the Google Maps actor alongside other Apify
+        runs via asyncio.gather.
+        """
+        try:
+            if self.google_api_key:
+                leads = self._search_via_google_places_api(search_input)
+                if leads:
+                    return leads
+            
+            if self.apify_token:
+                return await self._asearch_via_apify(search_input)
+            
+            logger.error("No API key or Apify token configured for Google Maps search")
+            return []
+        
+        except Exception as e:
+            logger.error(f"Error searching Google Maps: {e}")
+            return []
+    
+    async def _asearch_via_apify(self, search_input: GoogleMapsSearchInput) -> List[Lead]:
+        """Search using Apify Google Maps actor (async)."""
+        try:
+            actor_input = self._build_actor_input(search_input)
+            
+            config = ApifyScraperConfig(
+                actor_id=Config.APIFY_ACTOR_IDS.get("google_maps", "apify/google-maps-scraper"),
+                token=self.apify_token,
+                timeout=Config.APIFY_DEFAULT_TIMEOUT,
+                poll_interval=Config.APIFY_POLL_INTERVAL,
+                cache_dir=Config.APIFY_CACHE_DIR,
+                cache_ttl=Config.APIFY_CACHE_TTL,
+            )
+            
+            async with ApifyScraperTool(config) as scraper:
+                result = await scraper.arun(actor_input)
+            
+            if not result.get("success"):
+                logger.error(f"Failed to search Google Maps: {result.get('error')}")
+                return []
+            
+            leads = self._parse_results(result.get("results", []), search_input.location)
+            logger.info(f"Successfully created {len(leads)} leads from Google Maps search")
+            
+            return leads
+        
+        except Exception as e:
+            logger.error(f"Error searching via Apify: {e}")
+            return []
+    
     def _build_actor_input(self, search_input: GoogleMapsSearchInput) -> Dict[str, Any]:
         """Build input for Apify Google Maps actor."""
         return {
@@ -121,73 +180,96 @@ class GoogleMapsBusinessSearchTool:
             "includePhoneNumbers": True,
         }
     
+    # Expected Apify item fields; missing ones are filled with None so the
+    # vectorized pass never KeyErrors on sparse results
+    _RESULT_COLUMNS = ("title", "name", "website", "phone", "address", "rating",
+                       "numberOfReviews", "type", "url")
+
     def _parse_results(self, results: List[Dict[str, Any]], location: str) -> List[Lead]:
-        """Parse search results into Lead objects."""
-        leads = []
-        
-        for item in results:
-            try:
-                company_size = None
-                if "numberOfReviews" in item:
-                    reviews = item.get("numberOfReviews", 0)
-                    if reviews > 500:
-                        company_size = "enterprise"
-                    elif reviews > 100:
-                        company_size = "mid"
-                    elif reviews > 20:
-                        company_size = "small"
-                    else:
-                        company_size = "micro"
-                
-                lead = Lead(
-                    company_name=item.get("title") or item.get("name") or "Unknown",
-                    company_website=item.get("website"),
-                    location=location,
-                    phone=item.get("phone"),
-                    industry=self._infer_industry(item),
-                    enrichment_sources=["google_maps_scraper"],
-                    lead_score=0.0,
-                    raw_data={
-                        "address": item.get("address"),
-                        "rating": item.get("rating"),
-                        "reviews": item.get("numberOfReviews"),
-                        "type": item.get("type"),
-                        "google_maps_url": item.get("url"),
-                        "company_size": company_size,
-                    }
-                )
-                leads.append(lead)
-            
-            except Exception as e:
-                logger.debug(f"Error parsing Google Maps result: {e}")
-                continue
+        """Parse search results into Lead objects in one vectorized pass."""
+        if not results:
+            return []
+
+        df = pd.DataFrame(results)
+        for col in self._RESULT_COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+
+        # C-level branch select replaces the per-item if/elif ladder; items
+        # without review counts keep company_size = None as before
+        reviews = pd.to_numeric(df["numberOfReviews"], errors="coerce")
+        counts = reviews.fillna(0).to_numpy()
+        df["company_size"] = np.select(
+            [counts > 500, counts > 100, counts > 20],
+            ["enterprise", "mid", "small"],
+            default="micro",
+        )
+        df.loc[reviews.isna(), "company_size"] = None
+        df["company_name"] = df["title"].fillna(df["name"]).fillna("Unknown")
         
+        # Industry classification in one vectorized extract over the whole
+        # column instead of a Python call per row
+        df["industry"] = (
+            df["type"].fillna("").str.lower()
+            .str.extract(self._INDUSTRY_RE, expand=False)
+            .map(self._INDUSTRY_MAP)
+        )
+
+        # pd.DataFrame fills missing cells with NaN, and model_construct
+        # below skips the validation that would reject them - downgrade
+        # every NaN to None so optional fields come out exactly as the
+        # old per-item .get() calls produced them
+        df = df.astype(object).where(df.notna(), None)
+
+        # One wall-clock read per batch; every lead from this scrape shares the
+        # run timestamp instead of paying datetime.now() per instantiation
+        batch_now = datetime.now()
+
+        leads = []
+        for row in df.to_dict(orient="records"):
+            # model_construct skips pydantic validation - this is trusted
+            # internal data straight from our own column mapping
+            leads.append(Lead.model_construct(
+                company_name=row["company_name"],
+                company_website=row["website"],
+                location=location,
+                phone=row["phone"],
+                industry=row["industry"],
+                enrichment_sources=["google_maps_scraper"],
+                lead_score=0.0,
+                created_at=batch_now,
+                updated_at=batch_now,
+                raw_data={
+                    "address": row["address"],
+                    "rating": row["rating"],
+                    "reviews": row["numberOfReviews"],
+                    "type": row["type"],
+                    "google_maps_url": row["url"],
+                    "company_size": row["company_size"],
+                }
+            ))
+
+        logger.debug(f"Parsed {len(leads)} Google Maps results")
         return leads
     
-    def _infer_industry(self, item: Dict[str, Any]) -> Optional[str]:
-        """Try to infer industry from business data."""
-        item_type = (item.get("type") or "").lower()
-        
-        # Map common business types to industries
-        type_mapping = {
-            "software": "Technology",
-            "saas": "Technology",
-            "consulting": "Consulting",
-            "agency": "Consulting",
-            "dental": "Healthcare",
-            "healthcare": "Healthcare",
-            "medical": "Healthcare",
-            "finance": "Financial Services",
-            "bank": "Financial Services",
-            "real estate": "Real Estate",
-            "retail": "Retail",
-            "restaurant": "Hospitality",
-            "hotel": "Hospitality",
-            "manufacturing": "Manufacturing",
-        }
-        
-        for key, industry in type_mapping.items():
-            if key in item_type:
-                return industry
-        
-        return None
+    # Map common business types to industries. Compiled once into a single
+    # capturing alternation so classifying a whole result page is one
+    # vectorized str.extract over the "type" column.
+    _INDUSTRY_MAP = {
+        "software": "Technology",
+        "saas": "Technology",
+        "consulting": "Consulting",
+        "agency": "Consulting",
+        "dental": "Healthcare",
+        "healthcare": "Healthcare",
+        "medical": "Healthcare",
+        "finance": "Financial Services",
+        "bank": "Financial Services",
+        "real estate": "Real Estate",
+        "retail": "Retail",
+        "restaurant": "Hospitality",
+        "hotel": "Hospitality",
+        "manufacturing": "Manufacturing",
+    }
+    _INDUSTRY_RE = re.compile("(" + "|".join(map(re.escape, _INDUSTRY_MAP)) + ")")
+
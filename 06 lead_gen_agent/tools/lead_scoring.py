@@ -3,13 +3,17 @@ Lead Scoring Tool - LLM-based lead scoring and analysis.
 Scores leads against an Ideal Customer Profile (ICP).
 """
 
+import hashlib
 import logging
-import json
+import os
+import re
+
+import orjson
 from typing import Dict, Any, Optional
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from langchain_core.output_parsers import StrOutputParser
 
 from ..models import Lead, LeadScoreResult, PriorityBucket, ICPConfig, ScoringWeights
 from ..config import Config
@@ -17,6 +21,45 @@ from ..config import Config
 logger = logging.getLogger(__name__)
 
 
+def _lead_id(lead: Lead) -> str:
+    """Stable content-addressed lead id.
+
+    hash() is salted per process, so the old hash()%1000 suffix was
+    unreproducible across runs and collision-prone at scale. BLAKE2s over
+    company and contact name gives a 64-bit id that is stable everywhere,
+    which also makes it usable as a cache key.
+    """
+    digest = hashlib.blake2s(
+        f"{lead.company_name}|{lead.name or ''}".encode(), digest_size=8
+    ).hexdigest()
+    return f"lead_{digest}"
+
+
+
+_llm_cache_enabled = False
+
+
+def _enable_llm_cache() -> None:
+    """Back all LLM calls with a persistent sqlite cache.
+
+    LangChain keys on (prompt, llm_string), which already captures model and
+    temperature, so re-scoring an unchanged lead set is served from disk
+    instead of re-spending API calls.
+    """
+    global _llm_cache_enabled
+    if _llm_cache_enabled:
+        return
+    try:
+        from langchain_community.cache import SQLiteCache
+        from langchain.globals import set_llm_cache
+        
+        set_llm_cache(SQLiteCache(database_path=os.path.join(Config.STORAGE_PATH, "llm_cache.sqlite")))
+        _llm_cache_enabled = True
+    except Exception as e:
+        logger.debug(f"Could not enable LLM cache: {e}")
+
+
+
 class LeadScoringInput(BaseModel):
     """Input for lead scoring."""
     
@@ -40,11 +83,15 @@ class LeadScoringTool:
     
     def __init__(self):
         """Initialize the scoring tool."""
+        _enable_llm_cache()
         self.llm = ChatOpenAI(
             model_name=Config.OPENAI_MODEL_ADVANCED,  # Use better model for reasoning
             temperature=0.2,  # Low temperature for consistent scoring
             timeout=Config.LLM_TIMEOUT,
         )
+        # ICP prompt text keyed by the config's JSON dump; the ICP is
+        # constant across a batch, so it is rendered once per run, not per lead
+        self._icp_description_cache: Dict[str, str] = {}
         self._setup_scoring_chain()
     
     def score_lead(self, input_data: LeadScoringInput) -> LeadScoreResult:
@@ -75,7 +122,7 @@ class LeadScoringTool:
             priority = self._determine_priority(score)
             
             result = LeadScoreResult(
-                lead_id=f"lead_{input_data.lead.company_name}_{hash(str(input_data.lead.name)) % 1000}",
+                lead_id=_lead_id(input_data.lead),
                 company_name=input_data.lead.company_name,
                 lead_score=score,
                 priority=priority,
@@ -143,6 +190,9 @@ Format your response as JSON with fields: score, analysis, priority"""
                 "geography_weight", "role_seniority_weight", "hiring_signal_weight"
             ],
         )
+        # Built once; LLMChain is deprecated and allocating a chain per call
+        # paid construction/validation cost for every lead
+        self.chain = self.scoring_prompt | self.llm | StrOutputParser()
     
     def _build_scoring_context(
         self,
@@ -151,20 +201,7 @@ Format your response as JSON with fields: score, analysis, priority"""
         weights: ScoringWeights
     ) -> Dict[str, Any]:
         """Build context for LLM scoring."""
-        # Build ICP description
-        icp_parts = []
-        if icp_config.target_company_sizes:
-            icp_parts.append(f"Target company sizes: {', '.join(icp_config.target_company_sizes)}")
-        if icp_config.target_industries:
-            icp_parts.append(f"Target industries: {', '.join(icp_config.target_industries)}")
-        if icp_config.preferred_tech_stack:
-            icp_parts.append(f"Preferred tech stack: {', '.join(icp_config.preferred_tech_stack)}")
-        if icp_config.target_geographies:
-            icp_parts.append(f"Target geographies: {', '.join(icp_config.target_geographies)}")
-        if icp_config.target_roles:
-            icp_parts.append(f"Target roles: {', '.join(icp_config.target_roles)}")
-        
-        icp_description = "\n".join(icp_parts) if icp_parts else "No specific ICP defined"
+        icp_description = self._describe_icp(icp_config)
         
         # Extract tech stack
         tech_stack = []
@@ -205,32 +242,58 @@ Format your response as JSON with fields: score, analysis, priority"""
             "hiring_signal_weight": weights.hiring_signal_weight,
         }
     
+    def _describe_icp(self, icp_config: ICPConfig) -> str:
+        """Render the ICP as prompt text, cached per distinct config."""
+        cache_key = icp_config.model_dump_json()
+        cached = self._icp_description_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        icp_parts = []
+        if icp_config.target_company_sizes:
+            icp_parts.append(f"Target company sizes: {', '.join(icp_config.target_company_sizes)}")
+        if icp_config.target_industries:
+            icp_parts.append(f"Target industries: {', '.join(icp_config.target_industries)}")
+        if icp_config.preferred_tech_stack:
+            icp_parts.append(f"Preferred tech stack: {', '.join(icp_config.preferred_tech_stack)}")
+        if icp_config.target_geographies:
+            icp_parts.append(f"Target geographies: {', '.join(icp_config.target_geographies)}")
+        if icp_config.target_roles:
+            icp_parts.append(f"Target roles: {', '.join(icp_config.target_roles)}")
+        
+        description = "\n".join(icp_parts) if icp_parts else "No specific ICP defined"
+        self._icp_description_cache[cache_key] = description
+        return description
+    
     def _analyze_lead(self, context: Dict[str, Any]) -> str:
         """Use LLM to analyze lead."""
         try:
-            chain = LLMChain(llm=self.llm, prompt=self.scoring_prompt)
-            response = chain.run(**context)
-            return response
+            return self.chain.invoke(context)
         except Exception as e:
             logger.error(f"Error in LLM analysis: {e}")
             return f"Analysis failed: {str(e)}"
     
+    # Matches "score": 85 (possibly fractional) in JSON-ish output, or the
+    # first standalone 1-3 digit number in plain text. Compiled once at class
+    # scope so extraction is a single scan, not a findall over the full reply.
+    _SCORE_RE = re.compile(r'"score"\s*:\s*(\d{1,3}(?:\.\d+)?)|\b(\d{1,3})\b')
+
     def _extract_score(self, analysis: str) -> float:
         """Extract numeric score from LLM response."""
-        try:
-            # Try to parse JSON
-            data = json.loads(analysis)
-            score = data.get("score")
-            if isinstance(score, (int, float)):
-                return float(min(100, max(0, score)))
-        except (json.JSONDecodeError, KeyError):
-            pass
+        # Only attempt a full JSON parse when the response actually looks
+        # like JSON; plain-text analyses skip straight to the regex scan
+        if analysis.lstrip().startswith("{"):
+            try:
+                data = orjson.loads(analysis)
+                score = data.get("score")
+                if isinstance(score, (int, float)):
+                    return float(min(100, max(0, score)))
+            except (orjson.JSONDecodeError, KeyError):
+                pass
         
-        # Try to find a number between 0-100
-        import re
-        matches = re.findall(r"\b(\d{1,3})\b", analysis)
-        for match in matches:
-            score = float(match)
+        # First match wins - no allocation of a full match list
+        for match in self._SCORE_RE.finditer(analysis):
+            score = float(match.group(1) or match.group(2))
             if 0 <= score <= 100:
                 return score
         
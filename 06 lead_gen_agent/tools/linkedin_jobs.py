@@ -4,14 +4,155 @@ Uses Apify for ToS-compliant scraping.
 """
 
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from .apify_scraper import ApifyScraperTool, ApifyScraperConfig
-from ..models import JobPosting, Lead
+from ..models import JobPosting, Lead, fast_lead
 from ..config import Config
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ahocorasick
+except ImportError:  # optional speedup; extractors fall back to plain scans
+    ahocorasick = None
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:  # optional cross-run dedup; skipped when unavailable
+    ScalableBloomFilter = None
+
+
+def _job_key(job: JobPosting) -> str:
+    """Stable dedup key for a posting: URL, else company/title/location.
+
+    job_id is deliberately not used because absent ids are backfilled with
+    the item index, which would make every duplicate look unique.
+    """
+    if job.job_url:
+        return str(job.job_url)
+    return f"{job.company_name.lower()}|{job.title.lower()}|{(job.location or '').lower()}"
+
+
+# Common tech keywords: canonical tech label -> keywords that imply it
+_TECH_KEYWORDS = {
+    "python": ["python"],
+    "javascript": ["javascript", "js", "node.js", "nodejs"],
+    "java": ["java"],
+    "golang": ["go", "golang"],
+    "rust": ["rust"],
+    "csharp": ["c#", "csharp", ".net"],
+    "react": ["react", "reactjs"],
+    "vue": ["vue", "vuejs"],
+    "angular": ["angular"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud"],
+    "azure": ["azure", "microsoft azure"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "docker": ["docker"],
+    "sql": ["sql", "postgres", "mysql", "postgresql"],
+    "nosql": ["mongodb", "dynamodb", "cassandra"],
+    "ai/ml": ["machine learning", "deep learning", "ai", "llm", "gpt"],
+}
+
+# Seniority tiers in priority order: the first tier with a hit wins
+_SENIORITY_KEYWORDS = {
+    "entry": ["entry", "junior", "internship"],
+    "mid": ["mid-level", "mid-career", "intermediate"],
+    "senior": ["senior", "lead", "principal"],
+    "executive": ["manager", "director", "vp", "c-level"],
+}
+
+
+def _invert(keyword_map):
+    """Flatten a label -> keywords map into ((keyword, label), ...) pairs.
+
+    Built once at import and frozen; longest keywords sort first so
+    multi-word phrases win over their prefixes in the alternation fallback.
+    """
+    pairs = ((kw, label) for label, kws in keyword_map.items() for kw in kws)
+    return tuple(sorted(pairs, key=lambda pair: -len(pair[0])))
+
+
+_TECH_INVERTED = _invert(_TECH_KEYWORDS)
+_SENIORITY_INVERTED = _invert(_SENIORITY_KEYWORDS)
+
+
+def _build_automaton(inverted):
+    """Compile inverted keyword pairs into an Aho-Corasick automaton.
+
+    One automaton pass finds every keyword hit in O(text + hits) instead of a
+    fresh substring scan per keyword. Hits carry the keyword alongside its
+    label so _word_bounded_hits can boundary-check them. Returns None when
+    pyahocorasick is not installed; callers then fall back to the plain loop.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, label in inverted:
+        automaton.add_word(keyword, (keyword, label))
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same character class as regex \w, for manual boundary checks."""
+    return ch == "_" or ch.isalnum()
+
+
+def _word_bounded_hits(automaton, text: str) -> set:
+    """Labels for automaton hits that sit on word boundaries.
+
+    Applies the same per-edge rule as the alternation fallback: a keyword
+    edge that is a word character must not touch another word character,
+    while a non-word edge (the "#" in "c#", the "." in ".net") carries no
+    constraint. Keeps the two extractor paths byte-for-byte in agreement.
+    """
+    hits = set()
+    for end, (keyword, label) in automaton.iter(text):
+        start = end - len(keyword) + 1
+        if _is_word_char(keyword[0]) and start > 0 and _is_word_char(text[start - 1]):
+            continue
+        if _is_word_char(keyword[-1]) and end + 1 < len(text) and _is_word_char(text[end + 1]):
+            continue
+        hits.add(label)
+    return hits
+
+
+_TECH_AUTOMATON = _build_automaton(_TECH_INVERTED)
+_SENIORITY_AUTOMATON = _build_automaton(_SENIORITY_INVERTED)
+
+
+def _build_alternation(inverted):
+    """Compile inverted keyword pairs into (pattern, keyword -> label).
+
+    One findall over a compiled alternation replaces a substring test per
+    keyword when the automaton path is unavailable. Boundaries are applied
+    per keyword edge: a lookaround guards an edge only when it is a word
+    character, so "js" cannot fire inside "nodejs" while "c#" and ".net" -
+    whose edges would give \b the wrong anchor - still match.
+    """
+    pieces = []
+    for kw, _ in inverted:
+        left = r"(?<!\w)" if _is_word_char(kw[0]) else ""
+        right = r"(?!\w)" if _is_word_char(kw[-1]) else ""
+        pieces.append(left + re.escape(kw) + right)
+    pattern = re.compile("(" + "|".join(pieces) + ")")
+    return pattern, dict(inverted)
+
+
+_TECH_RE, _KW_TO_TECH = _build_alternation(_TECH_INVERTED)
+_SENIORITY_RE, _KW_TO_SENIORITY = _build_alternation(_SENIORITY_INVERTED)
+
+# Tier priority resolved to ranks once so picking the winning tier is a
+# single min() over the hit set instead of a walk over the keyword map
+_SENIORITY_RANK = {level: rank for rank, level in enumerate(_SENIORITY_KEYWORDS)}
+
+
 
 class LinkedInJobsInput(BaseModel):
     """Input schema for LinkedIn jobs search."""
@@ -44,6 +185,7 @@ class LinkedInJobsTool:
             token: Apify token (defaults to Config.APIFY_TOKEN)
         """
         self.token = token or Config.APIFY_TOKEN
+        self._seen_jobs = None
         if not self.token:
             logger.warning("APIFY_TOKEN not configured. LinkedIn scraping will not work.")
     
@@ -71,6 +213,8 @@ class LinkedInJobsTool:
                 token=self.token,
                 timeout=Config.APIFY_DEFAULT_TIMEOUT,
                 poll_interval=Config.APIFY_POLL_INTERVAL,
+                cache_dir=Config.APIFY_CACHE_DIR,
+                cache_ttl=Config.APIFY_CACHE_TTL,
             )
             
             scraper = ApifyScraperTool(config)
@@ -91,27 +235,86 @@ class LinkedInJobsTool:
             logger.error(f"Error searching LinkedIn jobs: {e}")
             return []
     
-    def create_leads_from_jobs(self, job_postings: List[JobPosting]) -> List[Lead]:
+    def iter_jobs(self, search_input: LinkedInJobsInput):
+        """
+        Stream job postings as Apify dataset items arrive.
+        
+        Generator counterpart of search_jobs: each item is parsed the moment
+        it downloads, so parse CPU overlaps network wait and peak memory is
+        one item instead of the whole result list.
+        
+        Yields:
+            JobPosting objects
+        """
+        if not self.token:
+            logger.error("APIFY_TOKEN not set. Cannot scrape LinkedIn jobs.")
+            return
+        
+        try:
+            actor_input = self._build_actor_input(search_input)
+            
+            config = ApifyScraperConfig(
+                actor_id=Config.APIFY_ACTOR_IDS.get("linkedin_jobs", "apify/linkedin-jobs-scraper"),
+                token=self.token,
+                timeout=Config.APIFY_DEFAULT_TIMEOUT,
+                poll_interval=Config.APIFY_POLL_INTERVAL,
+                cache_dir=Config.APIFY_CACHE_DIR,
+                cache_ttl=Config.APIFY_CACHE_TTL,
+            )
+            
+            with ApifyScraperTool(config) as scraper:
+                for idx, item in enumerate(scraper.run_stream(actor_input)):
+                    job = _parse_one(item, idx)
+                    if job is not None:
+                        yield job
+        
+        except Exception as e:
+            logger.error(f"Error searching LinkedIn jobs: {e}")
+    
+    def create_leads_from_jobs(
+        self, job_postings: List[JobPosting], skip_seen: bool = True
+    ) -> List[Lead]:
         """
         Convert job postings into leads based on hiring signals.
         
         Args:
             job_postings: List of job postings
+            skip_seen: consult and update the cross-run seen-jobs filter.
+                Pass False for synthetic sample postings - persisting those
+                fixed entries would make every later demo run come back empty.
         
         Returns:
             List of Lead objects with hiring company information
         """
         leads = []
+        # Postings already ingested by an earlier scrape skip Lead
+        # construction and all downstream enrichment/scoring
+        seen_jobs = self._load_seen_jobs() if skip_seen else None
+        skipped = 0
+        # One wall-clock read per batch; every lead from this scrape shares the
+        # run timestamp instead of paying datetime.now() per instantiation
+        batch_now = datetime.now()
         
         for job in job_postings:
-            # Create a lead for each hiring company
-            lead = Lead(
+            if seen_jobs is not None:
+                key = _job_key(job)
+                if key in seen_jobs:
+                    skipped += 1
+                    continue
+                seen_jobs.add(key)
+            
+            # Create a lead for each hiring company. fast_lead skips
+            # pydantic validation; every field here comes off an
+            # already-validated JobPosting
+            lead = fast_lead(
                 company_name=job.company_name,
                 company_website=job.company_website,
                 location=job.location,
                 source_job_posting=job,
                 enrichment_sources=["linkedin_jobs_scraper"],
                 lead_score=0.0,  # Will be scored by LeadScoringTool
+                created_at=batch_now,
+                updated_at=batch_now,
                 raw_data={
                     "job_title": job.title,
                     "job_url": str(job.job_url) if job.job_url else None,
@@ -121,8 +324,49 @@ class LinkedInJobsTool:
             )
             leads.append(lead)
         
+        if skipped:
+            logger.info(f"Skipped {skipped} previously ingested job postings")
+        if skip_seen:
+            self._save_seen_jobs()
+        
         return leads
     
+    def _seen_jobs_path(self) -> str:
+        """Path of the persisted seen-jobs bloom filter."""
+        return os.path.join(Config.APIFY_CACHE_DIR, "seen_jobs.bloom")
+    
+    def _load_seen_jobs(self):
+        """Load (or create) the cross-run bloom filter of ingested jobs.
+
+        Returns None when pybloom_live is not installed; callers then keep
+        every posting. A 0.1% false-positive rate is acceptable for lead
+        generation against the cost of re-scoring known duplicates.
+        """
+        if ScalableBloomFilter is None:
+            return None
+        if self._seen_jobs is not None:
+            return self._seen_jobs
+        try:
+            with open(self._seen_jobs_path(), "rb") as fh:
+                self._seen_jobs = ScalableBloomFilter.fromfile(fh)
+        except (OSError, ValueError):
+            self._seen_jobs = ScalableBloomFilter(
+                initial_capacity=10000, error_rate=0.001
+            )
+        return self._seen_jobs
+    
+    def _save_seen_jobs(self):
+        """Persist the bloom filter so later runs skip known postings."""
+        if self._seen_jobs is None:
+            return
+        try:
+            path = self._seen_jobs_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as fh:
+                self._seen_jobs.tofile(fh)
+        except OSError as e:
+            logger.debug(f"Could not persist seen-jobs filter: {e}")
+    
     def _build_actor_input(self, search_input: LinkedInJobsInput) -> Dict[str, Any]:
         """Build input for Apify LinkedIn actor."""
         actor_input = {
@@ -141,74 +385,81 @@ class LinkedInJobsTool:
     
     def _parse_results(self, results: List[Dict[str, Any]]) -> List[JobPosting]:
         """Parse Apify results into JobPosting objects."""
-        job_postings = []
-        
-        for item in results:
-            try:
-                job = JobPosting(
-                    job_id=item.get("id") or item.get("position_id") or str(len(job_postings)),
-                    title=item.get("title") or item.get("position_name") or "Unknown",
-                    company_name=item.get("company") or item.get("company_name") or "Unknown",
-                    company_website=item.get("company_url"),
-                    location=item.get("location") or item.get("geo_location") or "",
-                    job_url=item.get("url") or item.get("link"),
-                    description=item.get("description") or item.get("job_description") or "",
-                    seniority_level=item.get("seniority_level") or self._extract_seniority(item),
-                    employment_type=item.get("employment_type"),
-                    skills_required=item.get("skills", []),
-                    technologies=item.get("technologies", []) or self._extract_technologies(item),
-                    posted_date=None,  # Apify may not always provide this
-                )
-                job_postings.append(job)
-            except Exception as e:
-                logger.debug(f"Error parsing job result: {e}")
+        if not results:
+            return []
+        
+        # Per-item parsing is independent, and pydantic v2 validation plus
+        # the keyword scans run in C, so a small thread pool parses large
+        # pages concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(results))) as executor:
+            parsed = list(executor.map(_parse_one, results, range(len(results))))
+        parsed = [job for job in parsed if job is not None]
+        
+        # Large LinkedIn pulls repeat postings heavily; drop duplicates so
+        # downstream enrichment and scoring pay for each posting once
+        seen = set()
+        unique = []
+        for job in parsed:
+            key = _job_key(job)
+            if key in seen:
                 continue
+            seen.add(key)
+            unique.append(job)
         
-        return job_postings
-    
-    def _extract_seniority(self, item: Dict[str, Any]) -> Optional[str]:
-        """Try to extract seniority level from description."""
-        description = (item.get("description") or "").lower()
+        if len(unique) < len(parsed):
+            logger.info(f"Dropped {len(parsed) - len(unique)} duplicate job postings")
         
-        if any(x in description for x in ["entry", "junior", "internship"]):
-            return "entry"
-        elif any(x in description for x in ["mid-level", "mid-career", "intermediate"]):
-            return "mid"
-        elif any(x in description for x in ["senior", "lead", "principal"]):
-            return "senior"
-        elif any(x in description for x in ["manager", "director", "vp", "c-level"]):
-            return "executive"
+        return unique
+
+
+def _parse_one(item: Dict[str, Any], idx: int) -> Optional[JobPosting]:
+    """Parse a single Apify item into a JobPosting (None on failure)."""
+    try:
+        # Case-fold the description once and share it between both
+        # extractors instead of paying a full Unicode lower() pass each
+        description = item.get("description") or item.get("job_description") or ""
+        desc_lower = description.lower()
         
+        return JobPosting(
+            job_id=item.get("id") or item.get("position_id") or str(idx),
+            title=item.get("title") or item.get("position_name") or "Unknown",
+            company_name=item.get("company") or item.get("company_name") or "Unknown",
+            company_website=item.get("company_url"),
+            location=item.get("location") or item.get("geo_location") or "",
+            job_url=item.get("url") or item.get("link"),
+            description=description,
+            seniority_level=item.get("seniority_level") or _extract_seniority(desc_lower),
+            employment_type=item.get("employment_type"),
+            skills_required=item.get("skills", []),
+            technologies=item.get("technologies", []) or _extract_technologies(desc_lower),
+            posted_date=None,  # Apify may not always provide this
+        )
+    except Exception as e:
+        logger.debug(f"Error parsing job result: {e}")
+        return None
+
+
+def _extract_seniority(desc_lower: str) -> Optional[str]:
+    """Try to extract seniority level from a pre-lowercased description."""
+    if not desc_lower:
         return None
     
-    def _extract_technologies(self, item: Dict[str, Any]) -> List[str]:
-        """Extract technologies from job description."""
-        description = (item.get("description") or "").lower()
-        
-        # Common tech keywords
-        tech_keywords = {
-            "python": ["python"],
-            "javascript": ["javascript", "js", "node.js", "nodejs"],
-            "java": ["java"],
-            "golang": ["go", "golang"],
-            "rust": ["rust"],
-            "csharp": ["c#", "csharp", ".net"],
-            "react": ["react", "reactjs"],
-            "vue": ["vue", "vuejs"],
-            "angular": ["angular"],
-            "aws": ["aws", "amazon web services"],
-            "gcp": ["gcp", "google cloud"],
-            "azure": ["azure", "microsoft azure"],
-            "kubernetes": ["kubernetes", "k8s"],
-            "docker": ["docker"],
-            "sql": ["sql", "postgres", "mysql", "postgresql"],
-            "nosql": ["mongodb", "dynamodb", "cassandra"],
-            "ai/ml": ["machine learning", "deep learning", "ai", "llm", "gpt"],
-        }
-        
-        found_techs = []
-        for tech, keywords in tech_keywords.items():
-            if any(kw in description for kw in keywords):
-                found_techs.append(tech)
-        
-        return found_techs
+    if _SENIORITY_AUTOMATON is not None:
+        hits = _word_bounded_hits(_SENIORITY_AUTOMATON, desc_lower)
+    else:
+        hits = set(_KW_TO_SENIORITY[m] for m in _SENIORITY_RE.findall(desc_lower))
+    
+    if not hits:
+        return None
+    return min(hits, key=_SENIORITY_RANK.__getitem__)
+
+
+def _extract_technologies(desc_lower: str) -> List[str]:
+    """Extract technologies from a pre-lowercased job description."""
+    if not desc_lower:
+        return []
+    
+    if _TECH_AUTOMATON is not None:
+        return list(_word_bounded_hits(_TECH_AUTOMATON, desc_lower))
+    
+    return list(set(_KW_TO_TECH[m] for m in _TECH_RE.findall(desc_lower)))